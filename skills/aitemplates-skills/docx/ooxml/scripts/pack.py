@@ -3,29 +3,58 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N]
 """
 
 import argparse
-import shutil
+import json
+import os
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import lxml.etree
+
+try:
+    from .office_server import convert_document
+except ImportError:  # Run as a script rather than imported from the package
+    from office_server import convert_document
+
+# Media formats that are already compressed; deflating them again only costs time
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".tif", ".tiff", ".wdp", ".jxr",
+    ".mp3", ".m4a", ".wav", ".wma", ".mp4", ".m4v", ".mov", ".avi", ".wmv",
+    ".zip", ".docx", ".pptx", ".xlsx",
+}
+
+# Written by a selective unpack; lists the members left in the original file
+SIDECAR_NAME = ".ooxml-source.json"
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of threads for condensing XML parts (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +71,21 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=1):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    Parts are read from input_dir and written straight into the output zip:
+    XML and .rels parts are condensed in memory, other files are streamed as-is
+    (already-compressed media is stored without recompression).
+
+    If input_dir was unpacked selectively (unpack.py --parts), the members left
+    in the original file are copied from it without being decompressed.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of threads used to condense XML parts (default: 1)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +98,151 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
+    sidecar = input_dir / SIDECAR_NAME
+    source = read_sidecar(sidecar) if sidecar.exists() else None
+
+    files = [f for f in input_dir.rglob("*") if f.is_file() and f != sidecar]
+    xml_files = [f for f in files if is_xml_part(f.name)]
 
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
+    # Condense XML parts in memory, in parallel if requested (results keep file order)
+    if jobs > 1 and len(xml_files) > 1:
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        condensed = executor.map(lambda f: condense_xml_bytes(f.read_bytes()), xml_files)
+    else:
+        executor = None
+        condensed = (condense_xml_bytes(f.read_bytes()) for f in xml_files)
 
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
+    # Create final Office file as zip archive. It is written to a temporary file
+    # first: output_file may be the source of a selective unpack, which is read
+    # while writing and must survive a failed pack or validation.
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_name(
+        f".{output_file.stem}-{os.getpid()}{output_file.suffix}"
+    )
+    try:
+        with zipfile.ZipFile(temp_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for f in files:
+                arcname = f.relative_to(input_dir).as_posix()
+                if is_xml_part(f.name):
+                    zinfo = zipfile.ZipInfo.from_file(f, arcname)
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    zf.writestr(zinfo, next(condensed))
+                elif f.suffix.lower() in STORED_EXTENSIONS:
+                    zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(f, arcname)
+
+            # Splice back the members a selective unpack left in the original file
+            if source is not None:
+                on_disk = {f.relative_to(input_dir).as_posix() for f in files}
+                with zipfile.ZipFile(source["source"]) as source_zip:
+                    for name in source["members"]:
+                        if name not in on_disk:
+                            copy_member_raw(source_zip, source_zip.getinfo(name), zf)
 
         # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+        if validate and not validate_document(temp_file):
+            return False  # The corrupt file is deleted below
+
+        os.replace(temp_file, output_file)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        temp_file.unlink(missing_ok=True)
 
     return True
 
 
+def read_sidecar(sidecar):
+    """Load a selective-unpack sidecar and check its source file is unchanged.
+
+    Returns:
+        dict: "source" path of the original file and "members" mapping each
+            member left in it to its CRC at unpack time
+    """
+    source = json.loads(Path(sidecar).read_text())
+    source_file = Path(source["source"])
+    if not source_file.is_file():
+        raise ValueError(f"{source_file} referenced by {sidecar} not found")
+
+    with zipfile.ZipFile(source_file) as source_zip:
+        crcs = {info.filename: info.CRC for info in source_zip.infolist()}
+    for name, crc in source["members"].items():
+        if crcs.get(name) != crc:
+            raise ValueError(f"{name} in {source_file} changed since it was unpacked")
+    return source
+
+
+def copy_member_raw(source_zip, info, dest_zip):
+    """Copy a member between open ZipFiles without decompressing it.
+
+    zipfile has no public API for this, so the local header is rewritten and
+    the compressed bytes are copied as they are. This relies on zipfile
+    internals; if they are not what is expected, the member is decompressed
+    and written again instead.
+    """
+    if not _supports_raw_copy(source_zip, dest_zip):
+        dest_zip.writestr(info, source_zip.read(info))
+        return
+
+    source_fp = source_zip.fp
+    source_fp.seek(info.header_offset)
+    header = source_fp.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source_fp.seek(
+        info.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+    )
+
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    # Sizes are known, so write them in the header instead of a data descriptor
+    zinfo.flag_bits = info.flag_bits & ~0x08
+
+    dest_fp = dest_zip.fp
+    dest_fp.seek(dest_zip.start_dir)
+    zinfo.header_offset = dest_fp.tell()
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    dest_fp.write(zinfo.FileHeader(zip64))
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = source_fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+        dest_fp.write(chunk)
+        remaining -= len(chunk)
+
+    dest_zip.start_dir = dest_fp.tell()
+    dest_zip.filelist.append(zinfo)
+    dest_zip.NameToInfo[zinfo.filename] = zinfo
+    dest_zip._didModify = True
+
+
+def _supports_raw_copy(source_zip, dest_zip):
+    """Check for the zipfile internals copy_member_raw writes through."""
+    module_names = ("sizeFileHeader", "stringFileHeader", "ZIP64_LIMIT")
+    zip_names = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+    return (
+        all(hasattr(zipfile, name) for name in module_names)
+        and all(hasattr(dest_zip, name) for name in zip_names)
+        and getattr(source_zip, "fp", None) is not None
+        and not getattr(dest_zip, "_writing", False)
+        and hasattr(zipfile.ZipInfo, "FileHeader")
+    )
+
+
+def is_xml_part(name):
+    """Check whether a part name refers to an XML or .rels part."""
+    return name.endswith((".xml", ".rels"))
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -98,27 +254,14 @@ def validate_document(doc_path):
         case ".xlsx":
             filter_name = "html:HTML (StarCalc)"
 
+    # Conversions go through the shared soffice server when it is available
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
+            convert_document(doc_path, temp_dir, filter_name, timeout=10)
             return True
+        except RuntimeError as e:
+            print(f"Validation error: {e}", file=sys.stderr)
+            return False
         except FileNotFoundError:
             print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
             return True
@@ -132,27 +275,51 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_bytes(xml_file.read_bytes()))
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
+
+def condense_xml_bytes(content):
+    """Strip unnecessary whitespace and remove comments from XML content.
+
+    Whitespace-only text and comments are removed from every element except
+    text elements (w:t, a:t, ...), whose content is kept verbatim.
+
+    Args:
+        content: XML document as bytes
+
+    Returns:
+        bytes: Condensed UTF-8 encoded XML document
+    """
+    parser = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+    tree = lxml.etree.ElementTree(lxml.etree.fromstring(content, parser))
+
+    for element in list(tree.getroot().iter(lxml.etree.Element)):
         # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+        if element.prefix and lxml.etree.QName(element).localname == "t":
             continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+        # Remove whitespace-only text nodes
+        if element.text is not None and element.text.strip() == "":
+            element.text = None
+        for child in element:
+            if child.tail is not None and child.tail.strip() == "":
+                child.tail = None
+
+        # Remove comment nodes, keeping any text that follows them
+        for child in list(element):
+            if child.tag is lxml.etree.Comment:
+                if child.tail:
+                    previous = child.getprevious()
+                    if previous is not None:
+                        previous.tail = (previous.tail or "") + child.tail
+                    else:
+                        element.text = (element.text or "") + child.tail
+                element.remove(child)
+
+    standalone = ' standalone="yes"' if tree.docinfo.standalone else ""
+    declaration = f'<?xml version="1.0" encoding="UTF-8"{standalone}?>'.encode()
+    return declaration + lxml.etree.tostring(tree, encoding="UTF-8")
 
 
 if __name__ == "__main__":
@@ -3,19 +3,20 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import Rule, run_rules
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
@@ -48,17 +49,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         if not self.validate_against_xsd():
             all_valid = False
 
-        # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
-            all_valid = False
-
-        # Test 7: Deletion validation
-        if not self.validate_deletions():
-            all_valid = False
-
-        # Test 8: Insertion validation
-        if not self.validate_insertions():
-            all_valid = False
+        # Tests 6-8: Whitespace preservation, deletion and insertion validation
+        # share a single pass over document.xml
+        rules = run_rules(
+            self,
+            [WhitespacePreservationRule(self), DeletionRule(self), InsertionRule(self)],
+        )
+        for rule in rules:
+            if not rule.report():
+                all_valid = False
 
         # Test 9: Relationship ID reference validation
         if not self.validate_all_relationship_ids():
@@ -73,119 +72,31 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All whitespace is properly preserved")
-            return True
+        return run_rules(self, [WhitespacePreservationRule(self)])[0].report()
 
     def validate_deletions(self):
         """
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:t elements found within w:del elements")
-            return True
+        return run_rules(self, [DeletionRule(self)])[0].report()
 
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
         count = 0
 
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
+        # Read document.xml directly: it may not be among the (changed) xml_files
+        xml_file = self.unpacked_dir / "word" / "document.xml"
+        if not xml_file.exists():
+            return count
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-            except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
+        try:
+            root = self._parse(xml_file).getroot()
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
+        except Exception as e:
+            print(f"Error counting paragraphs in unpacked document: {e}")
 
         return count
 
@@ -194,19 +105,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Read document.xml straight from the original archive
+            content = self.original_package.read("word/document.xml")
+            root = lxml.etree.fromstring(content)
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,47 +123,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:delText elements within w:ins elements")
-            return True
+        return run_rules(self, [InsertionRule(self)])[0].report()
 
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
@@ -270,5 +135,80 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
+def _text_preview(text):
+    """Return a short repr of text for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class _DocumentXMLRule(Rule):
+    """Rule that only runs on document.xml files."""
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespacePreservationRule(_DocumentXMLRule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    tags = frozenset({f"{{{WORD_2006_NAMESPACE}}}t"})
+    failure_message = "FAILED - Found {count} whitespace preservation violations:"
+    success_message = "PASSED - All whitespace is properly preserved"
+
+    def visit(self, elem, xml_file):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            # Check if xml:space="preserve" attribute exists
+            xml_space_attr = f"{{{BaseSchemaValidator.XML_NAMESPACE}}}space"
+            if elem.get(xml_space_attr) != "preserve":
+                self.add_error(
+                    xml_file,
+                    f"Line {elem.sourceline}: w:t element with whitespace missing "
+                    f"xml:space='preserve': {_text_preview(text)}",
+                )
+
+
+class DeletionRule(_DocumentXMLRule):
+    """w:t elements must not appear within w:del elements (XSD does not catch this)."""
+
+    tags = frozenset({f"{{{WORD_2006_NAMESPACE}}}t"})
+    failure_message = "FAILED - Found {count} deletion validation violations:"
+    success_message = "PASSED - No w:t elements found within w:del elements"
+
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+
+    def visit(self, elem, xml_file):
+        if elem.text and next(elem.iterancestors(self.DEL_TAG), None) is not None:
+            self.add_error(
+                xml_file,
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: "
+                f"{_text_preview(elem.text)}",
+            )
+
+
+class InsertionRule(_DocumentXMLRule):
+    """w:delText is only allowed within w:ins if nested within a w:del."""
+
+    tags = frozenset({f"{{{WORD_2006_NAMESPACE}}}delText"})
+    failure_message = "FAILED - Found {count} insertion validation violations:"
+    success_message = "PASSED - No w:delText elements within w:ins elements"
+
+    INS_TAG = f"{{{WORD_2006_NAMESPACE}}}ins"
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+
+    def visit(self, elem, xml_file):
+        if next(elem.iterancestors(self.INS_TAG), None) is None:
+            return
+        if next(elem.iterancestors(self.DEL_TAG), None) is not None:
+            return
+        self.add_error(
+            xml_file,
+            f"Line {elem.sourceline}: <w:delText> within <w:ins>: "
+            f"{_text_preview(elem.text or '')}",
+        )
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -26,7 +26,10 @@ Usage:
     doc.save()
 """
 
+import filecmp
+import hashlib
 import html
+import os
 import random
 import shutil
 import tempfile
@@ -38,11 +41,15 @@ from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import XMLEditor, _keeps_indexes
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Parts copied into the workspace; anything else (media, fonts, embeddings) is
+# never edited in place and is hard-linked
+COPIED_SUFFIXES = {".xml", ".rels", ".vml"}
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -52,10 +59,16 @@ class DocxXMLEditor(XMLEditor):
     - w:author and w:date (for w:ins, w:del, w:comment elements)
     - w:id (for w:ins and w:del elements)
 
+    Several edits can be applied together with apply_edits().
+
     Attributes:
         dom (defusedxml.minidom.Document): The DOM document for direct manipulation
     """
 
+    # apply_edits operations that take XML content, and those that only take an element
+    CONTENT_OPERATIONS = ("replace_node", "insert_after", "insert_before", "append_to")
+    ELEMENT_OPERATIONS = ("suggest_deletion", "revert_insertion", "revert_deletion")
+
     def __init__(
         self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
     ):
@@ -71,20 +84,89 @@ class DocxXMLEditor(XMLEditor):
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        # Next free tracked change ID, found by one scan on first use
+        self._next_change_id = None
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Take the next available change ID.
+
+        All tracked change elements are scanned once; after that a running counter
+        is used, kept ahead of any IDs that inserted content brings with it.
+        """
+        if self._next_change_id is None:
+            self._next_change_id = 0
+            for tag in ("w:ins", "w:del"):
+                for elem in self.dom.getElementsByTagName(tag):
+                    self._reserve_change_id(elem.getAttribute("w:id"))
+        change_id = self._next_change_id
+        self._next_change_id += 1
+        return change_id
+
+    def _reserve_change_id(self, change_id):
+        """Make sure the running counter stays above an existing change ID."""
+        try:
+            self._next_change_id = max(self._next_change_id, int(change_id) + 1)
+        except ValueError:
+            pass
+
+    @_keeps_indexes
+    def apply_edits(self, edits):
+        """Apply a batch of edits in one pass.
+
+        Each edit is a tuple naming the editor method to apply:
+        - ("replace_node" | "insert_after" | "insert_before" | "append_to", elem, xml_content)
+        - ("suggest_deletion" | "revert_insertion" | "revert_deletion", elem)
+
+        All XML content is parsed with a single parser run, new elements share one
+        timestamp, and change IDs come from a running counter, so the cost grows
+        linearly with the number of edits. Edits are applied in order, exactly as
+        the corresponding single-edit calls would.
+
+        Args:
+            edits: List of edit tuples
+
+        Returns:
+            list: The return value of each edit, in order
+
+        Raises:
+            ValueError: If an edit is malformed (checked before anything is changed)
+
+        Example:
+            run = doc["word/document.xml"].get_node(tag="w:r", contains="old")
+            doc["word/document.xml"].apply_edits([
+                ("suggest_deletion", run),
+                ("insert_after", run, '<w:ins><w:r><w:t>new</w:t></w:r></w:ins>'),
+            ])
+        """
+        for index, edit in enumerate(edits):
+            if edit[0] in self.CONTENT_OPERATIONS:
+                expected = 3
+            elif edit[0] in self.ELEMENT_OPERATIONS:
+                expected = 2
+            else:
+                raise ValueError(f"Edit {index}: unknown operation {edit[0]!r}")
+            if len(edit) != expected:
+                raise ValueError(
+                    f"Edit {index}: {edit[0]} takes {expected - 1} argument(s), "
+                    f"got {len(edit) - 1}"
+                )
+
+        timestamp = _utc_timestamp()
+        fragments = iter(
+            self._parse_fragments(
+                [edit[2] for edit in edits if edit[0] in self.CONTENT_OPERATIONS]
+            )
+        )
+        results = []
+        for operation, elem, *content in edits:
+            if content:
+                nodes = next(fragments)
+                self._place_nodes(operation, elem, nodes)
+                self._inject_attributes_to_nodes(nodes, timestamp)
+                results.append(nodes)
+            else:
+                results.append(getattr(self, operation)(elem))
+        return results
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -113,7 +195,7 @@ class DocxXMLEditor(XMLEditor):
                 "http://schemas.microsoft.com/office/word/2010/wordml",
             )
 
-    def _inject_attributes_to_nodes(self, nodes):
+    def _inject_attributes_to_nodes(self, nodes, timestamp=None):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
 
         Adds attributes to elements that support them:
@@ -126,10 +208,9 @@ class DocxXMLEditor(XMLEditor):
 
         Args:
             nodes: List of DOM nodes to process
+            timestamp: Date to apply (default: now)
         """
-        from datetime import datetime, timezone
-
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        timestamp = timestamp or _utc_timestamp()
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
@@ -204,63 +285,63 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:r": add_rsid_to_r,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+
+        # Walk each subtree once (getElementsByTagName doesn't return the element itself)
+        elements = []
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
+            if node.nodeType == node.ELEMENT_NODE:
+                elements.append(node)
+                elements.extend(node.getElementsByTagName("*"))
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
+        # Keep new change IDs clear of IDs already present in the inserted content
+        if self._next_change_id is not None:
+            for elem in elements:
+                if elem.tagName in ("w:ins", "w:del") and elem.hasAttribute("w:id"):
+                    self._reserve_change_id(elem.getAttribute("w:id"))
+
+        for elem in elements:
+            handler = handlers.get(elem.tagName)
+            if handler is not None:
+                handler(elem)
 
+    @_keeps_indexes
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
         nodes = super().replace_node(elem, new_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_keeps_indexes
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
         nodes = super().insert_after(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_keeps_indexes
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
         nodes = super().insert_before(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_keeps_indexes
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
         nodes = super().append_to(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    @_keeps_indexes
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -336,9 +417,11 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._track_new_nodes([del_wrapper])
 
         return [elem]
 
+    @_keeps_indexes
     def revert_deletion(self, elem):
         """Reject a deletion by re-inserting the deleted content.
 
@@ -479,6 +562,7 @@ class DocxXMLEditor(XMLEditor):
 
         return para.toxml()
 
+    @_keeps_indexes
     def suggest_deletion(self, elem):
         """Mark a w:r or w:p element as deleted with tracked changes (in-place DOM manipulation).
 
@@ -528,6 +612,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._track_new_nodes([del_wrapper])
 
             return del_wrapper
 
@@ -556,6 +641,7 @@ class DocxXMLEditor(XMLEditor):
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
+                self._track_new_nodes([rPr])
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
@@ -586,6 +672,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._track_new_nodes([del_wrapper])
 
             return elem
 
@@ -593,6 +680,11 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+def _utc_timestamp() -> str:
+    """Current UTC time in the format used for w:date attributes."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -639,11 +731,12 @@ class Document:
         # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self.baseline_path = Path(self.temp_dir) / "original"
+        self._create_workspace()
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
+        # Temporary .docx of the baseline snapshot for validation (outside unpacked
+        # dir), packed on first validation or save
         self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
 
@@ -658,6 +751,13 @@ class Document:
         # Cache for lazy-loaded editors
         self._editors = {}
 
+        # (size, modification time) and content hash (None until known) of each
+        # workspace file as of its last successful validation, starting from
+        # the files mirrored from the original directory
+        self._validated_files = {
+            xml_path: (stat, None) for xml_path, stat in self._stat_workspace().items()
+        }
+
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
         self.comments_extended_path = self.word_path / "commentsExtended.xml"
@@ -665,8 +765,11 @@ class Document:
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
         # Load existing comments and determine next ID (before setup modifies files)
-        self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
+        self.existing_comments, self.next_comment_id = self._load_existing_comments()
+
+        # Attribute values of package entries (relationship targets, overrides,
+        # authors), collected once per file and updated as entries are added
+        self._registry = {}
 
         # Convenient access to document.xml editor (semi-private)
         self._document = self["word/document.xml"]
@@ -705,9 +808,16 @@ class Document:
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
+            editor = DocxXMLEditor(
                 file_path, rsid=self.rsid, author=self.author, initials=self.initials
             )
+            # Parts that match the original only need validation once modified
+            if (self.baseline_path / xml_path).exists():
+                original_content = (self.baseline_path / xml_path).read_bytes()
+                if hashlib.sha256(original_content).hexdigest() == editor.content_hash:
+                    stat, _ = self._validated_files.get(xml_path, (None, None))
+                    self._validated_files[xml_path] = (stat, editor.content_hash)
+            self._editors[xml_path] = editor
         return self._editors[xml_path]
 
     def add_comment(self, start, end, text: str) -> int:
@@ -835,16 +945,36 @@ class Document:
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
-    def validate(self) -> None:
+    def validate(self, incremental=True) -> None:
         """
         Validate the document against XSD schema and redlining rules.
 
+        By default only parts modified since the last successful validation (and
+        the parts related to them through .rels files) are validated.
+
+        Args:
+            incremental: If False, validates every part of the document (default: True).
+
         Raises:
             ValueError: If validation fails.
         """
+        dirty_parts = self._get_dirty_parts()
+        if incremental and not dirty_parts:
+            return
+        self._ensure_original_docx()
+
+        # Content type changes and removed files can affect any part, so validate everything
+        parts = None
+        if (
+            incremental
+            and "[Content_Types].xml" not in dirty_parts
+            and all((self.unpacked_path / xml_path).exists() for xml_path in dirty_parts)
+        ):
+            parts = dirty_parts
+
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path, self.original_docx, verbose=False, parts=parts
         )
         redlining_validator = RedliningValidator(
             self.unpacked_path, self.original_docx, verbose=False
@@ -853,14 +983,28 @@ class Document:
         # Run validations
         if not schema_validator.validate():
             raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+        if parts is None or "word/document.xml" in parts:
+            if not redlining_validator.validate():
+                raise ValueError("Redlining validation failed")
+
+        # Remember what passed so unchanged parts are skipped next time
+        for xml_path in dirty_parts:
+            file_path = self.unpacked_path / xml_path
+            if file_path.exists():
+                self._validated_files[xml_path] = (
+                    self._stat_file(file_path),
+                    hashlib.sha256(file_path.read_bytes()).hexdigest(),
+                )
+            else:
+                self._validated_files.pop(xml_path, None)
 
     def save(self, destination=None, validate=True) -> None:
         """
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        When saving back to the original directory, only files that differ from
+        it are written.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
@@ -881,38 +1025,125 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if target_path.resolve() == self.original_path.resolve():
+            self._write_back_changes()
+        else:
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
 
-    # ==================== Private: Initialization ====================
+    # ==================== Private: Workspace ====================
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _create_workspace(self):
+        """Mirror the original directory into unpacked_path and the baseline snapshot.
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
+        XML parts are copied, so writes to the workspace never reach the original
+        directory, and the baseline keeps the content as it was when the session
+        started. Other files are hard-linked to the original (or copied where
+        hard links are not possible, e.g. across file systems).
+        """
+        for source in self.original_path.rglob("*"):
+            relative_path = source.relative_to(self.original_path)
+            if source.is_dir():
+                (self.unpacked_path / relative_path).mkdir(parents=True, exist_ok=True)
+                (self.baseline_path / relative_path).mkdir(parents=True, exist_ok=True)
+                continue
+            for root in (self.baseline_path, self.unpacked_path):
+                target = root / relative_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if source.suffix.lower() in COPIED_SUFFIXES:
+                    shutil.copy2(source, target)
+                    continue
                 try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+        self.unpacked_path.mkdir(parents=True, exist_ok=True)
+        self.baseline_path.mkdir(parents=True, exist_ok=True)
+
+    def _write_back_changes(self):
+        """Copy new and modified workspace files back into the original directory."""
+        for file_path in self.unpacked_path.rglob("*"):
+            if not file_path.is_file():
+                continue
+            original_file = self.original_path / file_path.relative_to(self.unpacked_path)
+            if original_file.exists() and (
+                os.path.samefile(file_path, original_file)
+                or filecmp.cmp(file_path, original_file, shallow=False)
+            ):
+                continue
+            original_file.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(file_path, original_file)
+
+    def _ensure_original_docx(self):
+        """Pack the baseline snapshot into the validation baseline if not done yet."""
+        if not self.original_docx.exists():
+            pack_document(self.baseline_path, self.original_docx, validate=False)
+
+    # ==================== Private: Validation ====================
+
+    def _get_dirty_parts(self):
+        """Return the workspace files that may differ from their last validated content.
+
+        A file is only skipped if its size and modification time are unchanged
+        (and, for parts open in an editor, the saved content hash too), or if its
+        content hash still matches. This covers files written, added or removed
+        outside the editors; removed files are reported by their old path.
+        """
+        current = self._stat_workspace()
+        dirty = set()
+        for xml_path in current.keys() | self._validated_files.keys():
+            stat = current.get(xml_path)
+            validated_stat, validated_hash = self._validated_files.get(xml_path, (None, None))
+            editor = self._editors.get(xml_path)
+            saved_hash = editor.content_hash if editor is not None else None
+            if stat is not None and stat == validated_stat and saved_hash in (None, validated_hash):
+                continue
+            if stat is not None and validated_hash is not None:
+                content = (self.unpacked_path / xml_path).read_bytes()
+                if hashlib.sha256(content).hexdigest() == validated_hash:
+                    # Rewritten with the same content; skip the hash next time
+                    self._validated_files[xml_path] = (stat, validated_hash)
+                    continue
+            dirty.add(xml_path)
+        return dirty
+
+    def _stat_workspace(self):
+        """Return the (size, modification time) of every workspace file by relative path."""
+        return {
+            file_path.relative_to(self.unpacked_path).as_posix(): self._stat_file(file_path)
+            for file_path in self.unpacked_path.rglob("*")
+            if file_path.is_file()
+        }
+
+    @staticmethod
+    def _stat_file(file_path):
+        """Return the (size, modification time) used to spot changed workspace files."""
+        stat = file_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    # ==================== Private: Initialization ====================
 
     def _load_existing_comments(self):
-        """Load existing comments from files to enable replies."""
+        """Load existing comments from files to enable replies.
+
+        Returns:
+            tuple: (comment ID -> {"para_id": ...} for comments that can be replied to,
+                next available comment ID)
+        """
         if not self.comments_path.exists():
-            return {}
+            return {}, 0
 
         editor = self["word/comments.xml"]
         existing = {}
+        max_id = -1
 
         for comment_elem in editor.dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
+            try:
+                max_id = max(max_id, int(comment_id))
+            except ValueError:
+                continue
 
             # Find para_id from the w:p element within the comment
             para_id = None
@@ -926,7 +1157,7 @@ class Document:
 
             existing[int(comment_id)] = {"para_id": para_id}
 
-        return existing
+        return existing, max_id + 1
 
     # ==================== Private: Setup Methods ====================
 
@@ -968,6 +1199,7 @@ class Document:
         root = editor.dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
+        self._register(editor, "Override", "PartName", "/word/people.xml")
 
     def _add_relationship_for_people(self, path):
         """Add people.xml relationship to document.xml.rels if not already present."""
@@ -984,6 +1216,7 @@ class Document:
         # Create the relationship entry
         rel_xml = f'<{prefix}Relationship Id="{next_rid}" Type="http://schemas.microsoft.com/office/2011/relationships/people" Target="people.xml"/>'
         editor.append_to(root, rel_xml)
+        self._register(editor, "Relationship", "Target", "people.xml")
 
     def _update_settings(self, path, track_revisions=False):
         """Add RSID and optionally enable track revisions in settings.xml.
@@ -1159,24 +1392,32 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
-                return True
-        return False
+        return target in self._get_registry(editor, "Relationship", "Target")
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
-                return True
-        return False
+        return part_name in self._get_registry(editor, "Override", "PartName")
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
-            if person_elem.getAttribute("w15:author") == author:
-                return True
-        return False
+        return author in self._get_registry(editor, "w15:person", "w15:author")
+
+    def _get_registry(self, editor, tag, attr):
+        """Get the set of attr values of all tag elements in an editor's file.
+
+        Scans the file on first use; the methods that add entries keep the set
+        current through _register().
+        """
+        key = (editor.xml_path, tag, attr)
+        if key not in self._registry:
+            self._registry[key] = {
+                elem.getAttribute(attr) for elem in editor.dom.getElementsByTagName(tag)
+            }
+        return self._registry[key]
+
+    def _register(self, editor, tag, attr, value):
+        """Record an entry added to an editor's file."""
+        self._get_registry(editor, tag, attr).add(value)
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
@@ -1199,6 +1440,7 @@ class Document:
   <w15:presenceInfo w15:providerId="None" w15:userId="{escaped_author}"/>
 </w15:person>'''
         editor.append_to(root, person_xml)
+        self._register(editor, "w15:person", "w15:author", author)
 
     def _ensure_comment_relationships(self):
         """Ensure word/_rels/document.xml.rels has comment relationships."""
@@ -1239,6 +1481,7 @@ class Document:
         for rel_id, rel_type, target in rels:
             rel_xml = f'<{prefix}Relationship Id="rId{rel_id}" Type="{rel_type}" Target="{target}"/>'
             editor.append_to(root, rel_xml)
+            self._register(editor, "Relationship", "Target", target)
 
     def _ensure_comment_content_types(self):
         """Ensure [Content_Types].xml has comment content types."""
@@ -1274,3 +1517,4 @@ class Document:
                 f'<Override PartName="{part_name}" ContentType="{content_type}"/>'
             )
             editor.append_to(root, override_xml)
+            self._register(editor, "Override", "PartName", part_name)
@@ -221,6 +221,71 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_same_boxes_on_different_pages(self):
+        """Test that boxes on different pages don't count as intersecting"""
+        data = {
+            "form_fields": [
+                {
+                    "description": f"Field{page}",
+                    "page_number": page,
+                    "label_bounding_box": [10, 10, 50, 30],
+                    "entry_bounding_box": [60, 10, 150, 30]
+                }
+                for page in range(1, 4)
+            ]
+        }
+        
+        stream = self.create_json_stream(data)
+        messages = get_bounding_box_messages(stream)
+        self.assertTrue(any("SUCCESS" in msg for msg in messages))
+        self.assertFalse(any("FAILURE" in msg for msg in messages))
+    
+    def test_intersections_reported_in_field_order(self):
+        """Test that intersections are reported in field order, not position order"""
+        data = {
+            "form_fields": [
+                {
+                    "description": "Right",
+                    "page_number": 1,
+                    "label_bounding_box": [200, 10, 250, 30],
+                    "entry_bounding_box": [260, 10, 350, 30]
+                },
+                {
+                    "description": "Left",
+                    "page_number": 1,
+                    "label_bounding_box": [10, 10, 50, 30],
+                    "entry_bounding_box": [40, 10, 210, 30]  # Overlaps own label and Right's label
+                }
+            ]
+        }
+        
+        stream = self.create_json_stream(data)
+        messages = get_bounding_box_messages(stream)
+        self.assertEqual(messages, [
+            "Read 2 fields",
+            "FAILURE: intersection between label bounding box for `Right` ([200, 10, 250, 30]) and entry bounding box for `Left` ([40, 10, 210, 30])",
+            "FAILURE: intersection between label and entry bounding boxes for `Left` ([10, 10, 50, 30], [40, 10, 210, 30])",
+        ])
+    
+    def test_many_fields(self):
+        """Test a large form with one intersection per page"""
+        fields = []
+        for page in range(1, 11):
+            for row in range(100):
+                top = 10 + row * 20
+                fields.append({
+                    "description": f"Field{page}-{row}",
+                    "page_number": page,
+                    "label_bounding_box": [10, top, 50, top + 15],
+                    "entry_bounding_box": [60 if row else 45, top, 150, top + 15]
+                })
+        
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream)
+        failures = [msg for msg in messages if "FAILURE" in msg]
+        self.assertEqual(len(failures), 10)
+        self.assertTrue(all("Field" in msg and "-0`" in msg for msg in failures))
+    
 
 if __name__ == '__main__':
     unittest.main()
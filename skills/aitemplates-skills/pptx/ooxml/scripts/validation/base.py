@@ -2,11 +2,23 @@
 Base validator with common validation logic for document files.
 """
 
+import io
+import json
 import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .original import get_original_package
+
+# Compiled XSD schemas shared by every validator in this process.
+# Maps resolved schema path -> (mtime_ns, lxml.etree.XMLSchema)
+_SCHEMA_CACHE = {}
+
+# Written by a selective unpack; lists the members left in the original file
+SIDECAR_NAME = ".ooxml-source.json"
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +115,32 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self, unpacked_dir, original_file, verbose=False, jobs=1, parts=None
+    ):
+        """
+        Args:
+            unpacked_dir: Path to unpacked Office document directory
+            original_file: Path to original file (.docx/.pptx/.xlsx)
+            verbose: Enable verbose output
+            jobs: Number of processes for XSD schema validation
+            parts: Optional relative paths of changed parts (e.g. "word/document.xml").
+                Per-file checks then only run on these parts and the parts related
+                to them through .rels files; package-wide checks still see all files.
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.jobs = jobs
+
+        # Parsed trees shared by all checks, keyed by file path
+        self._trees = {}
+
+        # Members a selective unpack left in the original file (unpack.py --parts)
+        sidecar = self.unpacked_dir / SIDECAR_NAME
+        self.packed_members = (
+            set(json.loads(sidecar.read_text())["members"]) if sidecar.exists() else set()
+        )
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -117,13 +151,83 @@ class BaseSchemaValidator:
             f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
         ]
 
-        if not self.xml_files:
+        # Restrict per-file checks to the changed parts and their relationship closure
+        if parts is not None:
+            closure = self._relationship_closure(parts)
+            self.xml_files = [
+                f
+                for f in self.xml_files
+                if f.relative_to(self.unpacked_dir).as_posix() in closure
+            ]
+        elif not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    def _relationship_closure(self, parts):
+        """Expand changed parts with the parts whose validation depends on them.
+
+        A changed part brings in its own .rels file (its r:id references are
+        checked against it), and a changed .rels file brings in the part it
+        describes.
+
+        Returns:
+            set: Relative POSIX paths of the parts to validate
+        """
+        closure = set()
+        for part in parts:
+            path = PurePosixPath(Path(part).as_posix())
+            closure.add(path.as_posix())
+            if path.suffix == ".rels":
+                owner_name = path.name[: -len(".rels")]
+                if path.parent.name == "_rels" and owner_name:
+                    closure.add((path.parent.parent / owner_name).as_posix())
+            else:
+                closure.add((path.parent / "_rels" / f"{path.name}.rels").as_posix())
+        return closure
+
+    @property
+    def original_package(self):
+        """Shared read-only view of the original file, loaded on first use."""
+        return get_original_package(self.original_file)
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _parse(self, xml_file):
+        """Parse an XML file once and return the tree shared by all checks.
+
+        Checks must treat the returned tree as read-only.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        xml_file = Path(xml_file)
+        tree = self._trees.get(xml_file)
+        if tree is None:
+            tree = lxml.etree.parse(str(xml_file))
+            self._trees[xml_file] = tree
+        return tree
+
+    def _iter_elements(self, xml_file):
+        """Yield every element of an XML file in end-tag order.
+
+        Walks the shared tree if the file was already parsed. Otherwise the file
+        is streamed with iterparse and the resulting tree is kept for later checks.
+        """
+        xml_file = Path(xml_file)
+        tree = self._trees.get(xml_file)
+        if tree is not None:
+            events = lxml.etree.iterwalk(tree, events=("end",))
+        else:
+            events = lxml.etree.iterparse(str(xml_file), events=("end",))
+
+        for _, elem in events:
+            if isinstance(elem.tag, str):  # Skip comments and processing instructions
+                yield elem
+
+        if tree is None:
+            self._trees[xml_file] = events.root.getroottree()
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,7 +235,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +263,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -190,18 +294,17 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
+                # Skip mc:AlternateContent subtrees without modifying the shared tree
+                elements = root.xpath(
+                    "descendant-or-self::*[not(ancestor-or-self::mc:AlternateContent)]",
+                    namespaces={"mc": self.MC_NAMESPACE},
                 )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
 
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
+                # Now check IDs outside alternate content
+                for elem in elements:
                     # Get the element name without namespace
                     tag = (
                         elem.tag.split("}")[-1].lower()
@@ -293,7 +396,7 @@ class BaseSchemaValidator:
         for file_path in self.unpacked_dir.rglob("*"):
             if (
                 file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
+                and file_path.name not in ("[Content_Types].xml", SIDECAR_NAME)
                 and not file_path.name.endswith(".rels")
             ):  # This file is not referenced by .rels
                 all_files.append(file_path.resolve())
@@ -310,7 +413,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -343,6 +446,11 @@ class BaseSchemaValidator:
                             if target_path.exists() and target_path.is_file():
                                 referenced_files.add(target_path)
                                 all_referenced_files.add(target_path)
+                            elif (
+                                target_path.relative_to(self.unpacked_dir).as_posix()
+                                in self.packed_members
+                            ):
+                                continue  # Still in the original file, restored on pack
                             else:
                                 broken_refs.append((target, rel.sourceline))
                         except (OSError, ValueError):
@@ -390,8 +498,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -411,7 +517,7 @@ class BaseSchemaValidator:
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +540,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -531,7 +637,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,7 +699,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -673,7 +779,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +798,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd(self.xml_files)
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +817,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +843,30 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd on each file, in parallel when jobs > 1.
+
+        Returns:
+            list: (is_valid, new_errors_set) per file, in the same order as xml_files
+        """
+        if self.jobs <= 1 or len(xml_files) < 2:
+            return [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in xml_files
+            ]
+
+        # Each worker builds its own validator (and schema cache) once
+        jobs = min(self.jobs, len(xml_files))
+        chunksize = max(1, len(xml_files) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file),
+        ) as executor:
+            return list(
+                executor.map(_xsd_worker_validate, xml_files, chunksize=chunksize)
+            )
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -830,23 +959,27 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load XML (shared parse, copied before preprocessing)
+            xml_doc = self._parse(xml_file)
+
+            return self._validate_xml_doc_xsd(
+                xml_doc, schema_path, xml_file.relative_to(base_path)
+            )
+
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _validate_xml_doc_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML document against XSD schema. Returns (is_valid, errors_set)."""
+        try:
+            # Load schema (compiled once per process)
+            schema = self._load_schema(schema_path)
 
+            # Preprocess XML
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -866,42 +999,74 @@ class BaseSchemaValidator:
         except Exception as e:
             return False, {str(e)}
 
+    def _load_schema(self, schema_path):
+        """Return the compiled XSD schema for schema_path, compiling it at most once.
+
+        Compiled schemas are cached process-wide and keyed by path and mtime, so
+        repeated validations reuse them and edited schema files are recompiled.
+        """
+        schema_path = Path(schema_path).resolve()
+        mtime = schema_path.stat().st_mtime_ns
+
+        cached = _SCHEMA_CACHE.get(schema_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(
+                xsd_file, parser=parser, base_url=str(schema_path)
+            )
+            schema = lxml.etree.XMLSchema(xsd_doc)
+
+        _SCHEMA_CACHE[schema_path] = (mtime, schema)
+        return schema
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The file is read straight from the original archive and its error set is
+        memoized on the shared original package view.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        package = self.original_package
+        member_name = package.member_name(relative_path)
+        if member_name not in package.xsd_errors:
+            package.xsd_errors[member_name] = self._validate_original_member_xsd(
+                relative_path
+            )
+        return package.xsd_errors[member_name]
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+    def _validate_original_member_xsd(self, relative_path):
+        """Validate one member of the original archive. Returns its set of errors."""
+        content = self.original_package.read(relative_path)
+        if content is None:
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        try:
+            xml_doc = lxml.etree.parse(io.BytesIO(content))
+        except Exception as e:
+            return {str(e)}
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        is_valid, errors = self._validate_xml_doc_xsd(
+            xml_doc, schema_path, relative_path
+        )
+        return errors if errors else set()
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -947,5 +1112,20 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+# Validator owned by an XSD worker process, created by _init_xsd_worker
+_xsd_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file):
+    """Create the validator used by this XSD worker process."""
+    global _xsd_worker_validator
+    _xsd_worker_validator = validator_class(unpacked_dir, original_file)
+
+
+def _xsd_worker_validate(xml_file):
+    """Validate one file against its XSD schema inside a worker process."""
+    return _xsd_worker_validator.validate_file_against_xsd(xml_file, verbose=False)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
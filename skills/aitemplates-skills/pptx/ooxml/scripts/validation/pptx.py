@@ -5,15 +5,16 @@ Validator for PowerPoint presentation XML files against XSD schemas.
 import re
 
 from .base import BaseSchemaValidator
+from .rules import Rule, run_rules
+
+PRESENTATIONML_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
 
 
 class PPTXSchemaValidator(BaseSchemaValidator):
     """Validator for PowerPoint presentation XML files against XSD schemas."""
 
     # PowerPoint presentation namespace
-    PRESENTATIONML_NAMESPACE = (
-        "http://schemas.openxmlformats.org/presentationml/2006/main"
-    )
+    PRESENTATIONML_NAMESPACE = PRESENTATIONML_NAMESPACE
 
     # PowerPoint-specific element to relationship type mappings
     ELEMENT_RELATIONSHIP_TYPES = {
@@ -40,8 +41,13 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         if not self.validate_unique_ids():
             all_valid = False
 
+        # Tests 3 and 5 share a single pass over the XML files
+        uuid_rule, slide_layout_rule = run_rules(
+            self, [UUIDRule(self), SlideLayoutIdRule(self)]
+        )
+
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not uuid_rule.report():
             all_valid = False
 
         # Test 4: Relationship and file reference validation
@@ -49,7 +55,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not slide_layout_rule.report():
             all_valid = False
 
         # Test 6: Content type declarations
@@ -76,140 +82,20 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
-        errors = []
-        # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
-        uuid_pattern = re.compile(
-            r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
-        )
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
-                                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All UUID-like IDs contain valid hex values")
-            return True
-
-    def _looks_like_uuid(self, value):
-        """Check if a value has the general structure of a UUID."""
-        # Remove common UUID delimiters
-        clean_value = value.strip("{}()").replace("-", "")
-        # Check if it's 32 hex-like characters (could include invalid hex chars)
-        return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
+        return run_rules(self, [UUIDRule(self)])[0].report()
 
     def validate_slide_layout_ids(self):
         """Validate that sldLayoutId elements in slide masters reference valid slide layouts."""
-        import lxml.etree
-
-        errors = []
-
-        # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
-
-        if not slide_masters:
-            if self.verbose:
-                print("PASSED - No slide masters found")
-            return True
-
-        for slide_master in slide_masters:
-            try:
-                # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
-
-                # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
-
-                if not rels_file.exists():
-                    errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
-                    )
-                    continue
-
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
-
-                # Find all sldLayoutId elements in the slide master
-                for sld_layout_id in root.findall(
-                    f".//{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
-                ):
-                    r_id = sld_layout_id.get(
-                        f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
-                    )
-                    layout_id = sld_layout_id.get("id")
-
-                    if r_id and r_id not in valid_layout_rids:
-                        errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
-            for error in errors:
-                print(error)
-            print(
-                "Remove invalid references or add missing slide layouts to the relationships file."
-            )
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All slide layout IDs reference valid slide layouts")
-            return True
+        return run_rules(self, [SlideLayoutIdRule(self)])[0].report()
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
         slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse(rels_file).getroot()
 
                 # Find all slideLayout relationships
                 layout_rels = [
@@ -258,7 +144,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for rels_file in slide_rels_files:
             try:
                 # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse(rels_file).getroot()
 
                 # Find all notesSlide relationships
                 for rel in root.findall(
@@ -311,5 +197,93 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             return True
 
 
+class UUIDRule(Rule):
+    """ID attributes that look like UUIDs must contain only hex values."""
+
+    failure_message = "FAILED - Found {count} UUID ID validation errors:"
+    success_message = "PASSED - All UUID-like IDs contain valid hex values"
+
+    # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+    UUID_PATTERN = re.compile(
+        r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+    )
+
+    def visit(self, elem, xml_file):
+        for attr, value in elem.attrib.items():
+            # Check if this is an ID attribute
+            attr_name = attr.split("}")[-1].lower()
+            if attr_name == "id" or attr_name.endswith("id"):
+                # Check if value looks like a UUID (has the right length and pattern structure)
+                if self._looks_like_uuid(value):
+                    # Validate that it contains only hex characters in the right positions
+                    if not self.UUID_PATTERN.match(value):
+                        self.add_error(
+                            xml_file,
+                            f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters",
+                        )
+
+    def _looks_like_uuid(self, value):
+        """Check if a value has the general structure of a UUID."""
+        # Remove common UUID delimiters
+        clean_value = value.strip("{}()").replace("-", "")
+        # Check if it's 32 hex-like characters (could include invalid hex chars)
+        return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
+
+
+class SlideLayoutIdRule(Rule):
+    """sldLayoutId elements in slide masters must reference slide layout relationships."""
+
+    tags = frozenset({f"{{{PRESENTATIONML_NAMESPACE}}}sldLayoutId"})
+    failure_message = "FAILED - Found {count} slide layout ID validation errors:"
+    success_message = "PASSED - All slide layout IDs reference valid slide layouts"
+    empty_message = "PASSED - No slide masters found"
+    failure_hints = (
+        "Remove invalid references or add missing slide layouts to the relationships file.",
+    )
+
+    def applies_to(self, xml_file):
+        return (
+            xml_file.suffix == ".xml"
+            and xml_file.parent
+            == self.validator.unpacked_dir / "ppt" / "slideMasters"
+        )
+
+    def start_file(self, xml_file):
+        # Find the corresponding _rels file for this slide master
+        rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+        if not rels_file.exists():
+            self.add_error(
+                xml_file,
+                f"Missing relationships file: {rels_file.relative_to(self.validator.unpacked_dir)}",
+            )
+            return False
+
+        # Build a set of valid relationship IDs that point to slide layouts
+        try:
+            rels_root = self.validator._parse(rels_file).getroot()
+        except Exception as e:
+            self.add_error(xml_file, f"Error: {e}")
+            return False
+
+        self.valid_layout_rids = set()
+        for rel in rels_root.findall(
+            f".//{{{BaseSchemaValidator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            if "slideLayout" in rel.get("Type", ""):
+                self.valid_layout_rids.add(rel.get("Id"))
+        return True
+
+    def visit(self, elem, xml_file):
+        r_id = elem.get(f"{{{BaseSchemaValidator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
+        layout_id = elem.get("id")
+
+        if r_id and r_id not in self.valid_layout_rids:
+            self.add_error(
+                xml_file,
+                f"Line {elem.sourceline}: sldLayoutId with id='{layout_id}' "
+                f"references r:id='{r_id}' which is not found in slide layout relationships",
+            )
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
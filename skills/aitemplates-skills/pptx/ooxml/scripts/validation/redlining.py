@@ -2,21 +2,27 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+from bisect import bisect_left
 from pathlib import Path
 
+import lxml.etree
+
+from .original import get_original_package
+from .textdiff import ParagraphDiff, diff_paragraphs, diff_text
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(self, unpacked_dir, original_docx, verbose=False, max_mismatches=10):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        # Stop comparing after this many mismatched paragraphs (None for no limit)
+        self.max_mismatches = max_mismatches
         self.namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+            "w14": "http://schemas.microsoft.com/office/word/2010/wordml",
         }
 
     def validate(self):
@@ -27,92 +33,63 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+            modified_root = lxml.etree.parse(str(modified_file)).getroot()
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
+        # Redlining validation is only needed if tracked changes by Claude have been used.
+        claude_changes = modified_root.xpath(
+            ".//w:ins[@w:author='Claude'] | .//w:del[@w:author='Claude']",
+            namespaces=self.namespaces,
+        )
+        if not claude_changes:
             if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
+                print("PASSED - No tracked changes by Claude found.")
             return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        # Read original document.xml straight from the original docx
+        try:
+            original_content = get_original_package(self.original_docx).read(
+                "word/document.xml"
+            )
+        except Exception as e:
+            print(f"FAILED - Error reading original docx: {e}")
+            return False
+
+        if original_content is None:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+
+        try:
+            original_root = lxml.etree.fromstring(original_content)
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
+
+        # Compare the remaining text paragraph by paragraph
+        original_paragraphs = self._extract_paragraphs(original_root)
+        modified_paragraphs = self._extract_paragraphs(modified_root)
+        mismatches = self._find_mismatches(original_paragraphs, modified_paragraphs)
+
+        if mismatches:
+            error_message = self._generate_detailed_diff(
+                mismatches, original_paragraphs, modified_paragraphs
+            )
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _generate_detailed_diff(self, mismatches, original_paragraphs, modified_paragraphs):
+        """Generate detailed word-level differences for the mismatched paragraphs."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -125,94 +102,122 @@ class RedliningValidator:
             "  - To reject another's INSERTION: Nest <w:del> inside their <w:ins>",
             "  - To restore another's DELETION: Add new <w:ins> AFTER their <w:del>",
             "",
+            "Differences:",
+            "============",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        for change in mismatches:
+            if change.modified_index is not None:
+                _, para_id, number, line = modified_paragraphs[change.modified_index]
+                location = f"word/document.xml: Line {line}: Paragraph {number}"
+            else:
+                _, para_id, number, _ = original_paragraphs[change.original_index]
+                location = f"Original document.xml: Paragraph {number}"
+            if para_id:
+                location += f" (w14:paraId={para_id})"
+            error_parts.extend([location, f"  {change.format()}"])
+
+        if self.max_mismatches and len(mismatches) >= self.max_mismatches:
+            error_parts.append(
+                f"Stopped after {len(mismatches)} mismatched paragraphs; "
+                "fix these and validate again to see more"
+            )
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
+    def _find_mismatches(self, original_paragraphs, modified_paragraphs):
+        """Return ParagraphDiffs for paragraphs whose text differs.
 
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
+        Paragraphs carrying the same w14:paraId in both documents are used as
+        anchors. Anchored pairs are compared directly and only the stretches
+        between anchors are aligned by text, so an unchanged document costs one
+        comparison per paragraph. Stops after max_mismatches differences.
+        """
+        original_texts = [paragraph[0] for paragraph in original_paragraphs]
+        modified_texts = [paragraph[0] for paragraph in modified_paragraphs]
+        if original_texts == modified_texts:
+            return []
+
+        limit = self.max_mismatches
+        mismatches = []
+        previous_i = previous_j = 0
+        anchors = self._find_anchors(original_paragraphs, modified_paragraphs)
+        anchors.append((len(original_texts), len(modified_texts)))
+
+        for i, j in anchors:
+            # Align the unanchored paragraphs before this anchor by their text
+            if original_texts[previous_i:i] != modified_texts[previous_j:j]:
+                for change in diff_paragraphs(
+                    original_texts[previous_i:i], modified_texts[previous_j:j]
+                ):
+                    if change.original_index is not None:
+                        change.original_index += previous_i
+                    if change.modified_index is not None:
+                        change.modified_index += previous_j
+                    mismatches.append(change)
+                    if limit and len(mismatches) >= limit:
+                        return mismatches
+
+            if i < len(original_texts) and original_texts[i] != modified_texts[j]:
+                original, modified = original_texts[i], modified_texts[j]
+                mismatches.append(
+                    ParagraphDiff(i, j, original, modified, diff_text(original, modified))
                 )
+                if limit and len(mismatches) >= limit:
+                    return mismatches
 
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
+            previous_i, previous_j = i + 1, j + 1
 
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+        return mismatches
 
-        return None
+    def _find_anchors(self, original_paragraphs, modified_paragraphs):
+        """Pair up paragraphs by w14:paraId.
+
+        Only IDs that occur once in each document are used, and the pairs are
+        reduced to the longest run that is in order in both documents, so moved
+        paragraphs are aligned by text instead.
+
+        Returns:
+            list: (original_index, modified_index) pairs in document order
+        """
+        original_ids = {}
+        for index, (_, para_id, _, _) in enumerate(original_paragraphs):
+            if para_id:
+                original_ids[para_id] = None if para_id in original_ids else index
+
+        modified_ids = {}
+        for index, (_, para_id, _, _) in enumerate(modified_paragraphs):
+            if para_id:
+                modified_ids[para_id] = None if para_id in modified_ids else index
+
+        pairs = [
+            (original_ids[para_id], index)
+            for para_id, index in modified_ids.items()
+            if index is not None and original_ids.get(para_id) is not None
+        ]
+        pairs.sort(key=lambda pair: pair[1])
+
+        # Longest increasing subsequence of original positions (patience sorting)
+        tails = []
+        tail_pairs = []
+        previous = {}
+        for pair in pairs:
+            position = bisect_left(tails, pair[0])
+            previous[pair] = tail_pairs[position - 1] if position else None
+            if position == len(tails):
+                tails.append(pair[0])
+                tail_pairs.append(pair)
+            else:
+                tails[position] = pair[0]
+                tail_pairs[position] = pair
+
+        anchors = []
+        pair = tail_pairs[-1] if tail_pairs else None
+        while pair is not None:
+            anchors.append(pair)
+            pair = previous[pair]
+        anchors.reverse()
+        return anchors
 
     def _remove_claude_tracked_changes(self, root):
         """Remove tracked changes authored by Claude from the XML root."""
@@ -221,58 +226,57 @@ class RedliningValidator:
         author_attr = f"{{{self.namespaces['w']}}}author"
 
         # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
+        for elem in list(root.iter(ins_tag)):
+            if elem.get(author_attr) == "Claude" and elem.getparent() is not None:
+                elem.getparent().remove(elem)
 
         # Unwrap content in w:del elements where author is "Claude"
         deltext_tag = f"{{{self.namespaces['w']}}}delText"
         t_tag = f"{{{self.namespaces['w']}}}t"
 
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
+        for del_elem in list(root.iter(del_tag)):
+            parent = del_elem.getparent()
+            if del_elem.get(author_attr) != "Claude" or parent is None:
+                continue
 
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
+            # Convert w:delText to w:t before moving
+            for elem in del_elem.iter(deltext_tag):
+                elem.tag = t_tag
 
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
+            # Move all children of w:del to its parent before removing w:del
+            del_index = parent.index(del_elem)
+            for child in reversed(list(del_elem)):
+                parent.insert(del_index, child)
+            parent.remove(del_elem)
 
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+    def _extract_paragraphs(self, root):
+        """Extract the text of each paragraph from Word XML.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
+
+        Returns:
+            list: (text, para_id, number, line) tuples, where number is the
+                1-based position among all w:p elements and para_id is the
+                w14:paraId attribute or None
         """
         p_tag = f"{{{self.namespaces['w']}}}p"
         t_tag = f"{{{self.namespaces['w']}}}t"
+        para_id_attr = f"{{{self.namespaces['w14']}}}paraId"
 
         paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
+        for number, p_elem in enumerate(root.iter(p_tag), 1):
             # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
+            paragraph_text = "".join(
+                t_elem.text for t_elem in p_elem.iter(t_tag) if t_elem.text
+            )
             # Skip empty paragraphs - they don't affect content validation
             if paragraph_text:
-                paragraphs.append(paragraph_text)
+                paragraphs.append(
+                    (paragraph_text, p_elem.get(para_id_attr), number, p_elem.sourceline)
+                )
 
-        return "\n".join(paragraphs)
+        return paragraphs
 
 
 if __name__ == "__main__":
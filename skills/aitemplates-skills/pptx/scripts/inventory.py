@@ -16,25 +16,37 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    iter_inventory_dicts: Extract slides one at a time, optionally in parallel
     save_inventory: Save extracted data to JSON
+    write_inventory: Write extracted slides to JSON or NDJSON as they arrive
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--jobs N] [--ndjson]
 """
 
 import argparse
+import bisect
+import functools
+import itertools
 import json
+import os
 import platform
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
+try:
+    import numpy as np
+except ImportError:  # Glyph widths are summed in pure Python instead
+    np = None
+
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
 ParagraphDict = Dict[str, JsonValue]
@@ -45,6 +57,15 @@ InventoryData = Dict[
     str, Dict[str, "ShapeData"]
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
+SlideItem = Tuple[str, Dict[str, ShapeDict]]  # (slide_key, {shape_id -> ShapeDict})
+
+# Summed glyph advances ignore kerning, which changes line widths by well under
+# this fraction; closer to the wrap width than this, lines are measured exactly
+GLYPH_WIDTH_TOLERANCE = 0.01
+
+# Font files in the platform font directories, scanned once per process.
+# List of (font_dir, [file names in directory order]) in search order
+_FONT_CATALOG: Optional[List[Tuple[Path, List[str]]]] = None
 
 
 def main():
@@ -60,6 +81,9 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.ndjson --jobs 4 --ndjson
+    Extracts slides in 4 processes and writes one JSON line per slide
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +100,18 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for extracting slides (default: 1)",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help='Write one {"slide": ..., "shapes": ...} JSON object per line',
+    )
 
     args = parser.parse_args()
 
@@ -94,17 +130,20 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
-
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+
+        # Slides are written as they are extracted
+        slides = iter_inventory_dicts(
+            input_path, issues_only=args.issues_only, jobs=args.jobs
+        )
+        total_slides, total_shapes = write_inventory(
+            slides, output_path, ndjson=args.ndjson
+        )
 
         print(f"Output saved to: {args.output}")
 
         # Report statistics
-        total_slides = len(inventory)
-        total_shapes = sum(len(shapes) for shapes in inventory.values())
         if args.issues_only:
             if total_shapes > 0:
                 print(
@@ -280,67 +319,16 @@ class ShapeData:
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
+        Lookups go through a catalog of the system font directories that is
+        scanned once, and results are cached per font name.
+
         Args:
             font_name: Name of the font (e.g., 'Arial', 'Calibri')
 
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return _find_font_path(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -531,31 +519,59 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+    def _wrap_text_line(self, line: str, max_width_px: int, font) -> List[str]:
+        """Wrap a single line of text to fit within max_width_px.
+
+        Words are added to a line until the next one does not fit. Line widths
+        are differences of the cumulative glyph widths of the text; only widths
+        within GLYPH_WIDTH_TOLERANCE of max_width_px are measured exactly.
+        """
         if not line:
             return [""]
 
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
+        widths = _glyph_advances(font).prefix_widths(line)
+        tolerance = max_width_px * GLYPH_WIDTH_TOLERANCE + 1
+
+        def fits(start: int, end: int) -> bool:
+            estimate = widths[end] - widths[start]
+            if abs(estimate - max_width_px) > tolerance:
+                return estimate <= max_width_px
+            return _text_length(font, line[start:end]) <= max_width_px
+
+        if fits(0, len(line)):
             return [line]
 
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
+        # Need to wrap - find the character span of each word
+        starts, ends = [], []
+        position = 0
+        for word in line.split(" "):
+            starts.append(position)
+            ends.append(position + len(word))
+            position += len(word) + 1
+        end_widths = [widths[end] for end in ends]
 
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
+        wrapped = []
+        word_idx = 0
+        while word_idx < len(starts):
+            # Lines never start with the empty words between repeated spaces
+            if starts[word_idx] == ends[word_idx]:
+                word_idx += 1
+                continue
 
-        if current_line:
-            wrapped.append(current_line)
+            # Furthest word that fits, estimated by bisection, then verified;
+            # the first word is always placed, even if it is too wide
+            start = starts[word_idx]
+            last = bisect.bisect_right(
+                end_widths, widths[start] + max_width_px, lo=word_idx
+            ) - 1
+            last = max(last, word_idx)
+            while last + 1 < len(ends) and fits(start, ends[last + 1]):
+                last += 1
+            while last > word_idx and not fits(start, ends[last]):
+                last -= 1
+
+            wrapped.append(line[start : ends[last]])
+            word_idx = last + 1
 
         return wrapped
 
@@ -573,61 +589,38 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
-        # Calculate total height of all paragraphs
-        total_height_px = 0
-
+        paragraphs = []
         for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
+            if paragraph.text.strip():
+                para_data = ParagraphData(paragraph)
+                font_size = int(para_data.font_size or default_font_size)
+                paragraphs.append(
+                    (para_idx, para_data, font_size, paragraph.text.split("\n"))
+                )
 
-            para_data = ParagraphData(paragraph)
+        # Wrapping never puts fewer than one word on a line, so if the text fits
+        # with every word on its own line it cannot overflow and is not measured
+        max_height_px = self._get_text_height(
+            (para_idx, para_data, font_size, sum(len(line.split(" ")) for line in lines))
+            for para_idx, para_data, font_size, lines in paragraphs
+        )
+        if max_height_px <= usable_height_px:
+            return
 
-            # Load font for this paragraph
+        # Wrap all lines of each paragraph, with the font of the paragraph
+        line_counts = []
+        for para_idx, para_data, font_size, lines in paragraphs:
             font_name = para_data.font_name or "Arial"
-            font_size = int(para_data.font_size or default_font_size)
+            font = _load_font(self.get_font_path(font_name), font_size)
+            wrapped_count = 0
+            for line in lines:
+                wrapped_count += len(self._wrap_text_line(line, usable_width_px, font))
+            line_counts.append((para_idx, para_data, font_size, wrapped_count))
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
-
-            # Wrap all lines in this paragraph
-            all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
-                all_wrapped_lines.extend(wrapped)
-
-            if all_wrapped_lines:
-                # Calculate line height
-                if para_data.line_spacing:
-                    # Custom line spacing explicitly set
-                    line_height_px = para_data.line_spacing * 96 / 72
-                else:
-                    # PowerPoint default single spacing (1.0x font size)
-                    line_height_px = font_size * 96 / 72
-
-                # Add space_before (except first paragraph)
-                if para_idx > 0 and para_data.space_before:
-                    total_height_px += para_data.space_before * 96 / 72
-
-                # Add paragraph text height
-                total_height_px += len(all_wrapped_lines) * line_height_px
-
-                # Add space_after
-                if para_data.space_after:
-                    total_height_px += para_data.space_after * 96 / 72
+        total_height_px = self._get_text_height(line_counts)
 
         # Check for overflow (ignore negligible overflows <= 0.05")
         if total_height_px > usable_height_px:
@@ -636,6 +629,37 @@ class ShapeData:
             if overflow_inches > 0.05:  # Only report significant overflows
                 self.frame_overflow_bottom = overflow_inches
 
+    @staticmethod
+    def _get_text_height(paragraph_lines: Iterable[Tuple[int, ParagraphData, int, int]]) -> float:
+        """Calculate the height in pixels of paragraphs with the given line counts.
+
+        Args:
+            paragraph_lines: (para_idx, para_data, font_size, line_count) tuples
+        """
+        total_height_px = 0
+
+        for para_idx, para_data, font_size, line_count in paragraph_lines:
+            # Calculate line height
+            if para_data.line_spacing:
+                # Custom line spacing explicitly set
+                line_height_px = para_data.line_spacing * 96 / 72
+            else:
+                # PowerPoint default single spacing (1.0x font size)
+                line_height_px = font_size * 96 / 72
+
+            # Add space_before (except first paragraph)
+            if para_idx > 0 and para_data.space_before:
+                total_height_px += para_data.space_before * 96 / 72
+
+            # Add paragraph text height
+            total_height_px += line_count * line_height_px
+
+            # Add space_after
+            if para_data.space_after:
+                total_height_px += para_data.space_after * 96 / 72
+
+        return total_height_px
+
     def _calculate_slide_overflow(self) -> None:
         """Calculate if shape overflows the slide boundaries."""
         if self.slide_width_emu is None or self.slide_height_emu is None:
@@ -739,6 +763,144 @@ class ShapeData:
         return result
 
 
+def _get_font_catalog() -> List[Tuple[Path, List[str]]]:
+    """Scan the platform font directories once and return their font files.
+
+    Only files directly inside each directory are listed, in directory order.
+    """
+    global _FONT_CATALOG
+    if _FONT_CATALOG is not None:
+        return _FONT_CATALOG
+
+    # Define font directories by platform
+    if platform.system() == "Darwin":  # macOS
+        font_dirs = [
+            "/System/Library/Fonts/",
+            "/Library/Fonts/",
+            "~/Library/Fonts/",
+        ]
+    else:  # Linux
+        font_dirs = [
+            "/usr/share/fonts/truetype/",
+            "/usr/local/share/fonts/",
+            "~/.fonts/",
+        ]
+
+    catalog = []
+    for font_dir in font_dirs:
+        font_dir_path = Path(font_dir).expanduser()
+        try:
+            with os.scandir(font_dir_path) as entries:
+                names = [entry.name for entry in entries if entry.is_file()]
+        except (OSError, PermissionError):
+            continue
+        catalog.append((font_dir_path, names))
+
+    _FONT_CATALOG = catalog
+    return catalog
+
+
+@functools.lru_cache(maxsize=None)
+def _find_font_path(font_name: str) -> Optional[str]:
+    """Resolve a font name to a file in the font catalog."""
+    # Common font file variations to try
+    font_variations = [
+        font_name,
+        font_name.lower(),
+        font_name.replace(" ", ""),
+        font_name.replace(" ", "-"),
+    ]
+    if platform.system() == "Darwin":
+        extensions = [".ttf", ".otf", ".ttc", ".dfont"]
+    else:
+        extensions = [".ttf", ".otf"]
+    font_name_lower = font_name.lower().replace(" ", "")
+
+    for font_dir_path, names in _get_font_catalog():
+        # First try exact matches
+        available = set(names)
+        for variant in font_variations:
+            for ext in extensions:
+                if f"{variant}{ext}" in available:
+                    return str(font_dir_path / f"{variant}{ext}")
+
+        # Then try fuzzy matching - find files containing the font name
+        for name in names:
+            file_name_lower = name.lower()
+            if font_name_lower in file_name_lower and any(
+                file_name_lower.endswith(ext) for ext in extensions
+            ):
+                return str(font_dir_path / name)
+
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(font_path: Optional[str], size: int) -> Any:
+    """Load a font at the given size, falling back to PIL's default font."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+class GlyphAdvances:
+    """Advance widths of single characters in one font, for measuring text in bulk.
+
+    Widths are looked up from the font the first time a character is seen.
+    With NumPy, characters of the Basic Multilingual Plane live in an array
+    indexed by code point, so a whole line is measured with one gather and one
+    cumulative sum.
+    """
+
+    def __init__(self, font: Any):
+        self.font = font
+        self.table = np.full(0x10000, np.nan) if np is not None else None
+        self.advances: Dict[str, float] = {}
+
+    def prefix_widths(self, text: str) -> Any:
+        """Return the widths of text[:i] for i in 0..len(text), ignoring kerning."""
+        if self.table is not None and text:
+            codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+            if codes.max() < len(self.table):
+                advances = self.table[codes]
+                missing = np.isnan(advances)
+                if missing.any():
+                    for code in np.unique(codes[missing]):
+                        self.table[code] = self.font.getlength(chr(code))
+                    advances = self.table[codes]
+                return np.concatenate(([0.0], np.cumsum(advances)))
+
+        return list(itertools.accumulate(map(self._advance, text), initial=0.0))
+
+    def _advance(self, char: str) -> float:
+        if char not in self.advances:
+            self.advances[char] = self.font.getlength(char)
+        return self.advances[char]
+
+
+@functools.lru_cache(maxsize=64)
+def _glyph_advances(font: Any) -> GlyphAdvances:
+    """Return the glyph advance table of a font from _load_font."""
+    return GlyphAdvances(font)
+
+
+# Drawing context used only for text measurement
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@functools.lru_cache(maxsize=65536)
+def _text_length(font: Any, text: str) -> float:
+    """Measure the rendered width of text in pixels.
+
+    Fonts come from _load_font, so the same font object is used (and hashed)
+    for every lookup with the same path and size.
+    """
+    return _MEASURE_DRAW.textlength(text, font=font)
+
+
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
     # Must have a text frame with content
@@ -885,30 +1047,88 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Candidate pairs are found with a sweep over the horizontal extents, so only
+    shapes whose extents intersect on both axes are passed to calculate_overlap.
+    Results are recorded in the same order as comparing every pair.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(shape.left, shape.top, shape.width, shape.height) for shape in shapes]
+    # (low, high) extents on each axis; widths are not assumed to be positive
+    x_extents = [(min(left, left + w), max(left, left + w)) for left, _, w, _ in rects]
+    y_extents = [(min(top, top + h), max(top, top + h)) for _, top, _, h in rects]
+
+    # Sweep from left to right, keeping the shapes whose extent reaches the sweep line
+    pairs = []
+    active: List[int] = []
+    for j in sorted(range(len(shapes)), key=lambda index: x_extents[index][0]):
+        x_low = x_extents[j][0]
+        y_low, y_high = y_extents[j]
+        active = [i for i in active if x_extents[i][1] > x_low]
+        for i in active:
+            if y_extents[i][1] > y_low and y_high > y_extents[i][0]:
+                pairs.append((i, j) if i < j else (j, i))
+        active.append(j)
+
+    # Sorting the pairs keeps each shape's overlaps in shape order
+    for i, j in sorted(pairs):
+        overlaps, overlap_area = calculate_overlap(rects[i], rects[j])
+
+        if overlaps:
+            # Add shape IDs with overlap area in square inches
+            shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+            shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
+
+
+def extract_slide_inventory(slide: Any, issues_only: bool = False) -> Dict[str, ShapeData]:
+    """Extract the text shapes of a single slide.
+
+    Args:
+        slide: The PowerPoint slide object
+        issues_only: If True, only include shapes that have overflow or overlap issues
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    Returns:
+        Dictionary of shape_id -> ShapeData sorted by visual position (may be empty)
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return {}
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+        )
+        for swp in shapes_with_positions
+    ]
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
 
 
 def extract_text_inventory(
@@ -931,47 +1151,78 @@ def extract_text_inventory(
     inventory: InventoryData = {}
 
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+        slide_inventory = extract_slide_inventory(slide, issues_only=issues_only)
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
 
-        if not shapes_with_positions:
-            continue
+    return inventory
 
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
-            )
-            for swp in shapes_with_positions
-        ]
 
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
+def iter_inventory_dicts(
+    pptx_path: Path, issues_only: bool = False, jobs: int = 1
+) -> Iterator[SlideItem]:
+    """Extract slides one at a time as JSON-serializable dictionaries.
 
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
+    Slides are independent, so with jobs > 1 they are extracted in a pool of
+    processes that each open the presentation once. Slides are yielded in order
+    as soon as they are ready; slides without text shapes are skipped.
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of processes used to extract slides (default: 1)
 
-        if not sorted_shapes:
-            continue
+    Yields:
+        (slide_key, {shape_id: ShapeDict}) tuples
+    """
+    if jobs <= 1:
+        prs = Presentation(str(pptx_path))
+        for slide_idx, slide in enumerate(prs.slides):
+            item = _slide_item(slide_idx, slide, issues_only)
+            if item is not None:
+                yield item
+        return
+
+    slide_count = len(Presentation(str(pptx_path)).slides)
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_inventory_worker,
+        initargs=(str(pptx_path), issues_only),
+    ) as executor:
+        chunksize = max(1, slide_count // (jobs * 4))
+        for item in executor.map(
+            _inventory_worker_extract, range(slide_count), chunksize=chunksize
+        ):
+            if item is not None:
+                yield item
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
 
-    return inventory
+def _slide_item(slide_idx: int, slide: Any, issues_only: bool) -> Optional[SlideItem]:
+    """Extract one slide as a (slide_key, shapes) tuple, or None if it has no shapes."""
+    slide_inventory = extract_slide_inventory(slide, issues_only=issues_only)
+    if not slide_inventory:
+        return None
+    return (
+        f"slide-{slide_idx}",
+        {shape_key: shape_data.to_dict() for shape_key, shape_data in slide_inventory.items()},
+    )
+
+
+# Per-process state for parallel extraction: (Presentation, issues_only)
+_WORKER_STATE: Optional[Tuple[Any, bool]] = None
+
+
+def _init_inventory_worker(pptx_path: str, issues_only: bool) -> None:
+    """Open the presentation once in each worker process."""
+    global _WORKER_STATE
+    _WORKER_STATE = (Presentation(pptx_path), issues_only)
+
+
+def _inventory_worker_extract(slide_idx: int) -> Optional[SlideItem]:
+    """Extract one slide in a worker process."""
+    assert _WORKER_STATE is not None, "Worker was not initialized"
+    prs, issues_only = _WORKER_STATE
+    return _slide_item(slide_idx, prs.slides[slide_idx], issues_only)
 
 
 def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
@@ -1005,15 +1256,52 @@ def save_inventory(inventory: InventoryData, output_path: Path) -> None:
 
     Converts ShapeData objects to dictionaries for JSON serialization.
     """
-    # Convert ShapeData objects to dictionaries
-    json_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    slides = (
+        (
+            slide_key,
+            {shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()},
+        )
+        for slide_key, shapes in inventory.items()
+    )
+    write_inventory(slides, output_path)
+
 
+def write_inventory(
+    slides: Iterable[SlideItem], output_path: Path, ndjson: bool = False
+) -> Tuple[int, int]:
+    """Write slides to a file as they arrive, without holding the whole inventory.
+
+    The JSON output is identical to dumping the full inventory dict with
+    indent=2. With ndjson, each slide is written on its own line as
+    {"slide": slide_key, "shapes": {...}}.
+
+    Args:
+        slides: Iterable of (slide_key, {shape_id: ShapeDict}) tuples
+        output_path: Path of the output file
+        ndjson: Write newline-delimited JSON instead of a single object
+
+    Returns:
+        Tuple of (slide_count, shape_count) written
+    """
+    slide_count = shape_count = 0
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+        for slide_key, shapes in slides:
+            if ndjson:
+                record = {"slide": slide_key, "shapes": shapes}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                # Nest the slide's JSON one level into the top-level object
+                body = json.dumps(shapes, indent=2, ensure_ascii=False)
+                f.write("{\n" if not slide_count else ",\n")
+                f.write(f"  {json.dumps(slide_key, ensure_ascii=False)}: ")
+                f.write(body.replace("\n", "\n  "))
+            slide_count += 1
+            shape_count += len(shapes)
+
+        if not ndjson:
+            f.write("\n}" if slide_count else "{}")
+
+    return slide_count, shape_count
 
 
 if __name__ == "__main__":
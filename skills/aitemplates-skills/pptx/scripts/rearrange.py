@@ -7,16 +7,25 @@ Usage:
 
 This will create output.pptx using slides from template.pptx in the specified order.
 Slides can be repeated (e.g., 34 appears twice).
+
+The output package is assembled directly from the template's zip: each slide in
+the sequence is copied together with the parts only it uses (notes, charts,
+media, ...), while masters, layouts and themes are copied once. Media files
+with identical content are stored once, parts only used by dropped slides are
+left out, and presentation.xml is written once.
 """
 
 import argparse
-import shutil
+import hashlib
+import os
+import posixpath
+import re
 import sys
-from copy import deepcopy
+import zipfile
 from pathlib import Path
 
-import six
-from pptx import Presentation
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 
 
 def main():
@@ -72,78 +81,301 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
-def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
-
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
+# Namespaces used in the package parts that are rewritten
+CONTENT_TYPES_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+PRESENTATION_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+OFFICE_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# presentation.xml extension listing slide sections by slide id
+SECTIONS_EXT_URI = "{521415D9-36F7-43E2-AB2F-B90AF26B5E84}"
+FIRST_SLIDE_ID = 256  # Lowest slide id allowed in p:sldIdLst
+
+
+class Relationship:
+    """One relationship from a part's .rels file.
+
+    Attributes:
+        r_id: Relationship id referenced from the part's XML
+        reltype: Relationship type URI
+        target: Absolute part name (without leading "/") or the external URI
+        external: True for TargetMode="External"
+    """
+
+    def __init__(self, r_id, reltype, target, external):
+        self.r_id = r_id
+        self.reltype = reltype
+        self.target = target
+        self.external = external
+
+
+class SlideAssembler:
+    """Builds a new package from a sequence of slides of a template package.
+
+    Parts reachable from the package without going through a slide (masters,
+    layouts, themes, properties, ...) are shared and copied unchanged. Each
+    slide in the sequence gets its own copy of the parts reachable from it,
+    except media, which is stored once per distinct content.
+    """
+
+    def __init__(self, template_zip):
+        self.zip = template_zip
+        self.names = set(template_zip.namelist())
+        self._rels_cache = {}
+
+        content_types = etree.fromstring(template_zip.read("[Content_Types].xml"))
+        self.content_types = content_types
+        self.overrides = {
+            override.get("PartName").lstrip("/"): override.get("ContentType")
+            for override in content_types.iter(f"{{{CONTENT_TYPES_NS}}}Override")
+        }
+
+        # The presentation part and its slides, in presentation order
+        self.presentation_name = next(
+            rel.target for rel in self.rels("") if rel.reltype == RT.OFFICE_DOCUMENT
+        )
+        self.presentation = etree.fromstring(template_zip.read(self.presentation_name))
+        presentation_rels = {rel.r_id: rel for rel in self.rels(self.presentation_name)}
+        self.slides = [
+            presentation_rels[sld_id.get(f"{{{OFFICE_RELS_NS}}}id")].target
+            for sld_id in self.presentation.iter(f"{{{PRESENTATION_NS}}}sldId")
+        ]
+        self.shared = self._shared_parts()
+
+    def rels(self, partname):
+        """Return the relationships of a part ("" for the package itself)."""
+        if partname not in self._rels_cache:
+            directory, filename = posixpath.split(partname)
+            rels_name = posixpath.join(directory, "_rels", f"{filename}.rels")
+            relationships = []
+            if rels_name in self.names:
+                for rel in etree.fromstring(self.zip.read(rels_name)):
+                    external = rel.get("TargetMode") == "External"
+                    target = rel.get("Target")
+                    if not external:
+                        if target.startswith("/"):
+                            target = target[1:]
+                        else:
+                            target = posixpath.normpath(posixpath.join(directory, target))
+                    relationships.append(
+                        Relationship(rel.get("Id"), rel.get("Type"), target, external)
+                    )
+            self._rels_cache[partname] = relationships
+        return self._rels_cache[partname]
+
+    def assemble(self, output_path, slide_sequence):
+        """Write a package containing the given template slides in order."""
+        output_slides = [f"ppt/slides/slide{i + 1}.xml" for i in range(len(slide_sequence))]
+        used_names = set(self.shared) | set(output_slides)
+        # First copy of each template slide, for links between slides
+        first_copy = {}
+        for template_idx, slide_name in zip(slide_sequence, output_slides):
+            first_copy.setdefault(self.slides[template_idx], slide_name)
+
+        parts = {}  # output part name -> (bytes, content type or None)
+        media = {}  # content hash -> output part name
+
+        def copy_part(source, target, copies, slide_source, slide_target):
+            """Copy source to target with its non-shared closure (recursively)."""
+            copies[source] = target
+            kept, dropped = [], set()
+            for rel in self.rels(source):
+                if rel.external or rel.target in self.shared:
+                    kept.append((rel, rel.target))
+                elif rel.reltype == RT.SLIDE:
+                    # Links to slides point at their copy in the output, if any
+                    if rel.target == slide_source:
+                        kept.append((rel, slide_target))
+                    elif rel.target in first_copy:
+                        kept.append((rel, first_copy[rel.target]))
+                    else:
+                        dropped.add(rel.r_id)
+                elif rel.target not in self.names:
+                    dropped.add(rel.r_id)
+                elif rel.target in copies:
+                    kept.append((rel, copies[rel.target]))
+                elif self._is_media(rel.target):
+                    data = self.zip.read(rel.target)
+                    digest = hashlib.sha256(data).hexdigest()
+                    if digest not in media:
+                        media[digest] = self._allocate(rel.target, used_names)
+                        parts[media[digest]] = (data, self.overrides.get(rel.target))
+                    copies[rel.target] = media[digest]
+                    kept.append((rel, media[digest]))
+                else:
+                    name = self._allocate(rel.target, used_names)
+                    copy_part(rel.target, name, copies, slide_source, slide_target)
+                    kept.append((rel, name))
+
+            data = self.zip.read(source)
+            if dropped:
+                data = _remove_relationship_references(data, dropped)
+            parts[target] = (data, self.overrides.get(source))
+            if kept:
+                parts[_rels_name(target)] = (_write_rels(target, kept), None)
+
+        for i, (template_idx, slide_name) in enumerate(zip(slide_sequence, output_slides)):
+            source = self.slides[template_idx]
+            print(f"  [{i}] Slide {template_idx}")
+            copy_part(source, slide_name, {}, source, slide_name)
+
+        presentation_xml, presentation_rels = self._presentation(output_slides)
+
+        temp_path = Path(f"{output_path}.tmp")
         try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as out:
+                out.writestr("[Content_Types].xml", self._content_types(parts))
+                for name in sorted(self.shared, key=lambda name: name != "_rels/.rels"):
+                    if name == self.presentation_name:
+                        out.writestr(name, presentation_xml)
+                    elif name == _rels_name(self.presentation_name):
+                        out.writestr(name, presentation_rels)
+                    else:
+                        out.writestr(name, self.zip.read(name))
+                for name, (data, _) in parts.items():
+                    out.writestr(name, data)
+            os.replace(temp_path, output_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _shared_parts(self):
+        """Return the names of all parts and .rels files reachable without a slide."""
+        shared = set()
+        pending = [""]
+        while pending:
+            partname = pending.pop()
+            if partname:
+                shared.add(partname)
+            rels_name = _rels_name(partname)
+            if rels_name in self.names:
+                shared.add(rels_name)
+            for rel in self.rels(partname):
+                if rel.external or rel.reltype == RT.SLIDE:
+                    continue
+                if rel.target in self.names and rel.target not in shared:
+                    pending.append(rel.target)
+        return shared
+
+    def _is_media(self, partname):
+        """Media are binary leaf parts that can be shared by several slides."""
+        return partname.startswith("ppt/media/") and _rels_name(partname) not in self.names
+
+    def _allocate(self, partname, used_names):
+        """Reserve partname, or the next free name with the same stem and extension."""
+        if partname not in used_names:
+            used_names.add(partname)
+            return partname
+        match = re.match(r"(.*?)(\d*)(\.[^./]+)$", partname)
+        stem, number, extension = match.groups() if match else (partname, "", "")
+        number = int(number or 1)
+        while f"{stem}{number}{extension}" in used_names:
+            number += 1
+        name = f"{stem}{number}{extension}"
+        used_names.add(name)
+        return name
+
+    def _presentation(self, output_slides):
+        """Return presentation.xml and its .rels listing the output slides."""
+        presentation = self.presentation
+        kept_rels = [
+            (rel, rel.target)
+            for rel in self.rels(self.presentation_name)
+            if rel.reltype != RT.SLIDE
+        ]
+        used_ids = {rel.r_id for rel, _ in kept_rels}
+
+        sld_id_lst = presentation.find(f"{{{PRESENTATION_NS}}}sldIdLst")
+        if sld_id_lst is None:
+            sld_id_lst = etree.Element(f"{{{PRESENTATION_NS}}}sldIdLst")
+            anchor = presentation.find(f"{{{PRESENTATION_NS}}}notesMasterIdLst")
+            if anchor is None:
+                anchor = presentation.find(f"{{{PRESENTATION_NS}}}sldMasterIdLst")
+            anchor.addnext(sld_id_lst)
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+
+        number = 1
+        for i, slide_name in enumerate(output_slides):
+            while f"rId{number}" in used_ids:
+                number += 1
+            r_id = f"rId{number}"
+            used_ids.add(r_id)
+            kept_rels.append((Relationship(r_id, RT.SLIDE, slide_name, False), slide_name))
+            sld_id = etree.SubElement(sld_id_lst, f"{{{PRESENTATION_NS}}}sldId")
+            sld_id.set("id", str(FIRST_SLIDE_ID + i))
+            sld_id.set(f"{{{OFFICE_RELS_NS}}}id", r_id)
+
+        # Custom shows and sections refer to the template's slides
+        for custom_shows in presentation.findall(f"{{{PRESENTATION_NS}}}custShowLst"):
+            presentation.remove(custom_shows)
+        for ext in presentation.iter(f"{{{PRESENTATION_NS}}}ext"):
+            if ext.get("uri") == SECTIONS_EXT_URI:
+                ext.getparent().remove(ext)
+                break
+
+        presentation_xml = etree.tostring(
+            presentation, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+        return presentation_xml, _write_rels(self.presentation_name, kept_rels)
 
-    return new_slide
+    def _content_types(self, parts):
+        """Return [Content_Types].xml for the shared parts and the copied parts."""
+        content_types = etree.Element(
+            self.content_types.tag, nsmap=self.content_types.nsmap
+        )
+        for default in self.content_types.iter(f"{{{CONTENT_TYPES_NS}}}Default"):
+            etree.SubElement(content_types, default.tag, dict(default.attrib))
+        overrides = {
+            name: content_type
+            for name, content_type in self.overrides.items()
+            if name in self.shared
+        }
+        overrides.update(
+            (name, content_type) for name, (_, content_type) in parts.items() if content_type
+        )
+        for name, content_type in overrides.items():
+            etree.SubElement(
+                content_types,
+                f"{{{CONTENT_TYPES_NS}}}Override",
+                PartName=f"/{name}",
+                ContentType=content_type,
+            )
+        return etree.tostring(
+            content_types, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
 
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
+def _rels_name(partname):
+    """Return the name of the .rels file of a part ("" for the package)."""
+    directory, filename = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", f"{filename}.rels")
 
 
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
+def _write_rels(partname, relationships):
+    """Serialize (Relationship, output target) pairs as the .rels file of partname."""
+    directory = posixpath.dirname(partname)
+    root = etree.Element(f"{{{PACKAGE_RELS_NS}}}Relationships", nsmap={None: PACKAGE_RELS_NS})
+    for rel, target in relationships:
+        element = etree.SubElement(root, f"{{{PACKAGE_RELS_NS}}}Relationship")
+        element.set("Id", rel.r_id)
+        element.set("Type", rel.reltype)
+        if rel.external:
+            element.set("Target", target)
+            element.set("TargetMode", "External")
+        else:
+            element.set("Target", posixpath.relpath(target, directory or "."))
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
 
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
 
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+def _remove_relationship_references(data, r_ids):
+    """Remove r:* attributes that refer to relationships which were not copied."""
+    root = etree.fromstring(data)
+    prefix = f"{{{OFFICE_RELS_NS}}}"
+    for element in root.iter():
+        for name, value in list(element.attrib.items()):
+            if name.startswith(prefix) and value in r_ids:
+                del element.attrib[name]
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
@@ -155,76 +387,20 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         output_path: Path for output PPTX file
         slide_sequence: List of slide indices (0-based) to include
     """
-    # Copy template to preserve dimensions and theme
-    if template_path != output_path:
-        shutil.copy2(template_path, output_path)
-        prs = Presentation(output_path)
-    else:
-        prs = Presentation(template_path)
-
-    total_slides = len(prs.slides)
-
-    # Validate indices
-    for idx in slide_sequence:
-        if idx < 0 or idx >= total_slides:
-            raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
-
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
-
-    # Step 1: DUPLICATE repeated slides
-    print(f"Processing {len(slide_sequence)} slides from template...")
-    for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
-        else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
-            print(f"  [{i}] Using original slide {template_idx}")
-
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
-
-    # Save the presentation
-    prs.save(output_path)
+    with zipfile.ZipFile(template_path) as template_zip:
+        assembler = SlideAssembler(template_zip)
+        total_slides = len(assembler.slides)
+
+        # Validate indices
+        for idx in slide_sequence:
+            if idx < 0 or idx >= total_slides:
+                raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
+
+        print(f"Processing {len(slide_sequence)} slides from template...")
+        assembler.assemble(output_path, slide_sequence)
+
     print(f"\nSaved rearranged presentation to: {output_path}")
-    print(f"Final presentation has {len(prs.slides)} slides")
+    print(f"Final presentation has {len(slide_sequence)} slides")
 
 
 if __name__ == "__main__":
@@ -3,16 +3,27 @@
 
 Usage:
     python replace.py <input.pptx> <replacements.json> <output.pptx>
+    python replace.py --batch <input.pptx> <output_dir> <replacements.json>... [--jobs N]
 
 The replacements JSON should have the structure output by inventory.py.
 ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
+
+Batch mode fills one template with many replacement JSONs. The template is
+parsed and inventoried once (per worker process), and each deck is saved as
+<output_dir>/<replacements stem>.pptx. Decks with worsened overflow or
+formatting warnings are not saved; every deck's issues are listed in
+<output_dir>/replace-report.json.
 """
 
+import argparse
+import copy
+import io
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from inventory import InventoryData, extract_text_inventory
 from pptx import Presentation
@@ -211,35 +222,19 @@ def check_duplicate_keys(pairs):
     return result
 
 
-def apply_replacements(pptx_file: str, json_file: str, output_file: str):
-    """Apply text replacements from JSON to PowerPoint presentation."""
-
-    # Load presentation
-    prs = Presentation(pptx_file)
-
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
-
-    # Detect text overflow in original presentation
-    original_overflow = detect_frame_overflow(inventory)
-
-    # Load replacement data with duplicate key detection
+def load_replacements(json_file: str) -> Dict:
+    """Load replacement data with duplicate key detection."""
     with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
+        return json.load(f, object_pairs_hook=check_duplicate_keys)
 
-    # Validate replacements
-    errors = validate_replacements(inventory, replacements)
-    if errors:
-        print("ERROR: Invalid shapes in replacement JSON:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nPlease check the inventory and update your replacement JSON.")
-        print(
-            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
-        )
-        raise ValueError(f"Found {len(errors)} validation error(s)")
 
+def fill_shapes(
+    inventory: InventoryData, replacements: Dict, slide_count: int
+) -> Tuple[int, int, int]:
+    """Clear every inventoried shape and add the replacement paragraphs.
+
+    Returns (shapes_processed, shapes_cleared, shapes_replaced).
+    """
     # Track statistics
     shapes_processed = 0
     shapes_cleared = 0
@@ -252,7 +247,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
 
         slide_index = int(slide_key.split("-")[1])
 
-        if slide_index >= len(prs.slides):
+        if slide_index >= slide_count:
             print(f"Warning: Slide {slide_index} not found")
             continue
 
@@ -288,20 +283,17 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
 
                 apply_paragraph_properties(p, para_data)
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
+    return shapes_processed, shapes_cleared, shapes_replaced
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
 
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+def find_replacement_issues(
+    original_overflow: Dict[str, Dict[str, float]], updated_inventory: InventoryData
+) -> Tuple[List[str], List[str]]:
+    """Compare the inventory after replacement with the original overflow.
+
+    Returns (overflow_errors, warnings) as lists of messages.
+    """
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
@@ -326,6 +318,59 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 for warning in shape_data.warnings:
                     warnings.append(f"{slide_key}/{shape_key}: {warning}")
 
+    return overflow_errors, warnings
+
+
+def apply_replacements(pptx_file: str, json_file: str, output_file: str):
+    """Apply text replacements from JSON to PowerPoint presentation."""
+
+    # Load presentation
+    prs = Presentation(pptx_file)
+
+    # Get inventory of all text shapes (returns ShapeData objects)
+    # Pass prs to use same Presentation instance
+    inventory = extract_text_inventory(Path(pptx_file), prs)
+
+    # Detect text overflow in original presentation
+    original_overflow = detect_frame_overflow(inventory)
+
+    # Load replacement data with duplicate key detection
+    replacements = load_replacements(json_file)
+
+    # Validate replacements
+    errors = validate_replacements(inventory, replacements)
+    if errors:
+        print("ERROR: Invalid shapes in replacement JSON:")
+        for error in errors:
+            print(f"  - {error}")
+        print("\nPlease check the inventory and update your replacement JSON.")
+        print(
+            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+        )
+        raise ValueError(f"Found {len(errors)} validation error(s)")
+
+    shapes_processed, shapes_cleared, shapes_replaced = fill_shapes(
+        inventory, replacements, len(prs.slides)
+    )
+
+    # Check for issues after replacements
+    # Save to a temporary file and reload to avoid modifying the presentation during inventory
+    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+        prs.save(str(tmp_path))
+
+    try:
+        updated_inventory = extract_text_inventory(tmp_path)
+    finally:
+        tmp_path.unlink()  # Clean up temp file
+
+    overflow_errors, warnings = find_replacement_issues(
+        original_overflow, updated_inventory
+    )
+
     # Fail if there are any issues
     if overflow_errors or warnings:
         print("\nERROR: Issues detected in replacement output:")
@@ -353,8 +398,237 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     print(f"  - Shapes replaced: {shapes_replaced}")
 
 
+class TemplateFiller:
+    """A template parsed and inventoried once, then filled any number of times.
+
+    Each fill starts from deep copies of the template's pristine slide XML,
+    so the package is cloned in memory instead of being parsed again: layouts,
+    masters, themes and media are shared and saved unchanged, and only the
+    slide parts are rewritten.
+    """
+
+    def __init__(self, pptx_file: str):
+        self.pptx_path = Path(pptx_file)
+        self.prs = Presentation(pptx_file)
+        self.slide_parts = [slide.part for slide in self.prs.slides]
+
+        # Snapshot before the inventory, which adds empty <a:solidFill/> elements
+        self.pristine = [copy.deepcopy(part._element) for part in self.slide_parts]
+
+        self.inventory = extract_text_inventory(self.pptx_path, self.prs)
+        self.original_overflow = detect_frame_overflow(self.inventory)
+
+        # Locate each inventoried shape by its path within the slide XML
+        self.shape_paths = {}
+        for slide_key, shapes_dict in self.inventory.items():
+            slide_index = int(slide_key.split("-")[1])
+            tree = self.slide_parts[slide_index]._element.getroottree()
+            for shape_key, shape_data in shapes_dict.items():
+                self.shape_paths[(slide_key, shape_key)] = tree.getpath(
+                    shape_data.shape._element
+                )
+
+    def fill(self, replacements: Dict) -> Tuple[bytes, List[str], List[str]]:
+        """Apply one set of replacements to a fresh copy of the template.
+
+        Returns (pptx_bytes, overflow_errors, warnings).
+
+        Raises:
+            ValueError: If the replacements reference shapes that do not exist
+        """
+        errors = validate_replacements(self.inventory, replacements)
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        self._restore_slides()
+        inventory = self._rebind_inventory()
+        fill_shapes(inventory, replacements, len(self.slide_parts))
+
+        # Save before the inventory modifies the slides (see apply_replacements)
+        output = io.BytesIO()
+        self.prs.save(output)
+
+        updated_inventory = extract_text_inventory(self.pptx_path, self.prs)
+        overflow_errors, warnings = find_replacement_issues(
+            self.original_overflow, updated_inventory
+        )
+        return output.getvalue(), overflow_errors, warnings
+
+    def _restore_slides(self):
+        """Replace every slide's XML with a copy of the template's."""
+        for part, element in zip(self.slide_parts, self.pristine):
+            part._element = copy.deepcopy(element)
+            # Drop the cached Slide object, which still wraps the old XML
+            part.__dict__.pop("slide", None)
+
+    def _rebind_inventory(self) -> InventoryData:
+        """Map the template inventory onto the shapes of the restored slides."""
+        shapes_by_element = {}
+        for part in self.slide_parts:
+            pending = list(part.slide.shapes)
+            while pending:
+                shape = pending.pop()
+                shapes_by_element[shape._element] = shape
+                if hasattr(shape, "shapes"):
+                    pending.extend(shape.shapes)
+
+        inventory = {}
+        for slide_key, shapes_dict in self.inventory.items():
+            slide_index = int(slide_key.split("-")[1])
+            root = self.slide_parts[slide_index]._element
+            inventory[slide_key] = {}
+            for shape_key, shape_data in shapes_dict.items():
+                element = root.xpath(self.shape_paths[(slide_key, shape_key)])[0]
+                rebound = copy.copy(shape_data)
+                rebound.shape = shapes_by_element[element]
+                inventory[slide_key][shape_key] = rebound
+        return inventory
+
+
+def apply_batch_replacements(
+    pptx_file: str, json_files: List[str], output_dir: str, jobs: int = 1
+) -> Dict[str, Dict[str, Any]]:
+    """Fill one template with many replacement JSONs.
+
+    Args:
+        pptx_file: Template presentation
+        json_files: Replacement JSON files, one per output deck
+        output_dir: Directory for <json stem>.pptx outputs
+        jobs: Number of worker processes, each holding one parsed template
+
+    Returns:
+        Report of deck name -> {"output", "saved", "errors", "overflow", "warnings"}
+
+    Raises:
+        ValueError: If two JSON files share a stem, as their outputs would collide
+    """
+    files_by_stem: Dict[str, List[str]] = {}
+    for json_file in json_files:
+        files_by_stem.setdefault(Path(json_file).stem, []).append(json_file)
+    duplicates = [files for files in files_by_stem.values() if len(files) > 1]
+    if duplicates:
+        raise ValueError(
+            "Replacement JSONs must have distinct file names, got: "
+            + "; ".join(", ".join(files) for files in duplicates)
+        )
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (json_file, str(output_path / f"{Path(json_file).stem}.pptx"))
+        for json_file in json_files
+    ]
+
+    report = {}
+    if jobs <= 1:
+        _init_batch_worker(pptx_file)
+        results = (_batch_worker_fill(*task) for task in tasks)
+        for deck_name, deck_report in results:
+            report[deck_name] = deck_report
+            _print_deck_report(deck_name, deck_report)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_batch_worker, initargs=(pptx_file,)
+        ) as executor:
+            for deck_name, deck_report in executor.map(
+                _batch_worker_fill, *zip(*tasks)
+            ):
+                report[deck_name] = deck_report
+                _print_deck_report(deck_name, deck_report)
+
+    with open(output_path / "replace-report.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
+_FILLER: Optional[TemplateFiller] = None
+
+
+def _init_batch_worker(pptx_file: str) -> None:
+    """Parse and inventory the template once in each worker process."""
+    global _FILLER
+    _FILLER = TemplateFiller(pptx_file)
+
+
+def _batch_worker_fill(json_file: str, output_file: str) -> Tuple[str, Dict[str, Any]]:
+    """Fill the template with one replacement JSON and save it if it has no issues."""
+    assert _FILLER is not None, "Worker was not initialized"
+    deck_report: Dict[str, Any] = {
+        "output": output_file,
+        "saved": False,
+        "errors": [],
+        "overflow": [],
+        "warnings": [],
+    }
+    try:
+        pptx_bytes, overflow_errors, warnings = _FILLER.fill(load_replacements(json_file))
+    except (OSError, ValueError) as e:
+        deck_report["errors"].append(str(e))
+        return Path(json_file).stem, deck_report
+
+    deck_report["overflow"] = overflow_errors
+    deck_report["warnings"] = warnings
+    if not overflow_errors and not warnings:
+        Path(output_file).write_bytes(pptx_bytes)
+        deck_report["saved"] = True
+    return Path(json_file).stem, deck_report
+
+
+def _print_deck_report(deck_name: str, deck_report: Dict[str, Any]) -> None:
+    """Print one line per deck, followed by its issues."""
+    if deck_report["saved"]:
+        print(f"PASSED - {deck_name}: saved {deck_report['output']}")
+        return
+    print(f"FAILED - {deck_name}: not saved")
+    for error in deck_report["errors"]:
+        print(f"  - {error}")
+    for error in deck_report["overflow"]:
+        print(f"  - Text overflow worsened: {error}")
+    for warning in deck_report["warnings"]:
+        print(f"  - Formatting warning: {warning}")
+
+
+def batch_main(argv: List[str]):
+    """Command-line entry point for --batch."""
+    parser = argparse.ArgumentParser(
+        prog="replace.py --batch",
+        description="Fill one template with many replacement JSONs.",
+    )
+    parser.add_argument("input", help="Template PowerPoint file (.pptx)")
+    parser.add_argument("output_dir", help="Directory for the output decks")
+    parser.add_argument("replacements", nargs="+", help="Replacement JSON files")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to fill decks (default: 1)",
+    )
+    args = parser.parse_args(argv)
+
+    if not Path(args.input).exists():
+        print(f"Error: Input file '{args.input}' not found")
+        sys.exit(1)
+
+    try:
+        report = apply_batch_replacements(
+            args.input, args.replacements, args.output_dir, args.jobs
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    failed = sum(1 for deck_report in report.values() if not deck_report["saved"])
+    print(f"\nSaved {len(report) - failed} of {len(report)} decks to {args.output_dir}")
+    if failed:
+        sys.exit(1)
+
+
 def main():
     """Main entry point for command-line usage."""
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+
     if len(sys.argv) != 4:
         print(__doc__)
         sys.exit(1)
@@ -11,6 +11,7 @@ import os
 import platform
 from pathlib import Path
 from openpyxl import load_workbook
+from office_server import recalculate_document
 
 
 def setup_libreoffice_macro():
@@ -50,24 +51,15 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def run_recalc_macro(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate and save a file by running the LibreOffice macro in a one-shot soffice
     
     Returns:
-        dict with error locations and counts
+        Error message, or None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
-        return {'error': 'Failed to setup LibreOffice macro'}
+        return 'Failed to setup LibreOffice macro'
     
     cmd = [
         'soffice', '--headless', '--norestore',
@@ -94,9 +86,39 @@ def recalc(filename, timeout=30):
     if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
         error_msg = result.stderr or 'Unknown error during recalculation'
         if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
-            return {'error': 'LibreOffice macro not configured properly'}
+            return 'LibreOffice macro not configured properly'
         else:
-            return {'error': error_msg}
+            return error_msg
+    
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Use the shared soffice server if available, otherwise run the macro once
+    try:
+        recalculated = recalculate_document(abs_path, timeout)
+    except subprocess.TimeoutExpired:
+        recalculated = True  # A timeout is not an error here either; check the file as saved
+    
+    if not recalculated:
+        error = run_recalc_macro(abs_path, timeout)
+        if error:
+            return {'error': error}
     
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
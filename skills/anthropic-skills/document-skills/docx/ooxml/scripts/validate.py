@@ -3,7 +3,7 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--max-mismatches N]
 """
 
 import argparse
@@ -30,6 +30,20 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD schema validation (default: 1)",
+    )
+    parser.add_argument(
+        "--max-mismatches",
+        type=int,
+        default=10,
+        help="Stop the tracked-changes check after this many mismatched paragraphs "
+        "(0 for no limit, default: 10)",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -45,17 +59,30 @@ def main():
     # Run validations
     match file_extension:
         case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
+            validators = [
+                DOCXSchemaValidator(
+                    unpacked_dir, original_file, verbose=args.verbose, jobs=args.jobs
+                ),
+                RedliningValidator(
+                    unpacked_dir,
+                    original_file,
+                    verbose=args.verbose,
+                    max_mismatches=args.max_mismatches,
+                ),
+            ]
         case ".pptx":
-            validators = [PPTXSchemaValidator]
+            validators = [
+                PPTXSchemaValidator(
+                    unpacked_dir, original_file, verbose=args.verbose, jobs=args.jobs
+                )
+            ]
         case _:
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
     # Run validators
     success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+    for validator in validators:
         if not validator.validate():
             success = False
 
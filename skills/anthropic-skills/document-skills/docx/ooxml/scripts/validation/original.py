@@ -0,0 +1,73 @@
+"""
+Read-only view of the original Office file used as a validation baseline.
+"""
+
+import zipfile
+from pathlib import PurePosixPath, Path
+
+# Views shared by every validator in this process.
+# Maps resolved file path -> (mtime_ns, size, OriginalPackage)
+_PACKAGE_CACHE = {}
+
+
+class OriginalPackage:
+    """Lazily reads members of the original .docx/.pptx/.xlsx without extracting it.
+
+    Members are read straight from the zip on first access and kept in memory,
+    so validators comparing against the original never unpack it to disk.
+    Validators may also memoize per-member results in xsd_errors.
+
+    Attributes:
+        path: Path to the original Office file
+        xsd_errors: Memoized XSD error sets keyed by member name
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.xsd_errors = {}
+        self._members = {}
+        self._names = None
+
+    @property
+    def names(self):
+        """Set of member names in the original archive."""
+        if self._names is None:
+            with zipfile.ZipFile(self.path, "r") as zip_ref:
+                self._names = set(zip_ref.namelist())
+        return self._names
+
+    def member_name(self, relative_path):
+        """Convert a path relative to the unpacked directory into a zip member name."""
+        return PurePosixPath(*Path(relative_path).parts).as_posix()
+
+    def exists(self, relative_path):
+        """Check whether a member exists in the original archive."""
+        return self.member_name(relative_path) in self.names
+
+    def read(self, relative_path):
+        """Return the bytes of a member, or None if the original does not contain it."""
+        name = self.member_name(relative_path)
+        if name not in self._members:
+            if name not in self.names:
+                return None
+            with zipfile.ZipFile(self.path, "r") as zip_ref:
+                self._members[name] = zip_ref.read(name)
+        return self._members[name]
+
+
+def get_original_package(path):
+    """Return the shared OriginalPackage for path, reloading it if the file changed."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    cached = _PACKAGE_CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    package = OriginalPackage(path)
+    _PACKAGE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, package)
+    return package
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -4,7 +4,8 @@ Utilities for editing OOXML documents.
 
 This module provides XMLEditor, a tool for manipulating XML files with support for
 line-number-based node finding and DOM manipulation. Each element is automatically
-annotated with its original line and column position during parsing.
+annotated with its original line and column position during parsing, and lookups
+go through lazily built tag, attribute, and line indexes.
 
 Example usage:
     editor = XMLEditor("document.xml")
@@ -30,12 +31,36 @@ Example usage:
     editor.save()
 """
 
+import functools
+import hashlib
 import html
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from typing import Optional, Union
 
+import defusedxml.expatbuilder
 import defusedxml.minidom
-import defusedxml.sax
+
+# Elements whose text is document content, so whitespace-only text in them counts
+TEXT_ELEMENTS = {"w:t", "w:delText", "w:instrText", "w:delInstrText", "a:t", "m:t"}
+
+
+def _keeps_indexes(method):
+    """Decorate an XMLEditor method that updates the lookup indexes itself.
+
+    If the indexes matched the DOM before the call, they are marked as still
+    matching afterwards, so the method's own DOM changes don't force a rebuild.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        indexes_current = not self._dom_changed()
+        result = method(self, *args, **kwargs)
+        if indexes_current:
+            self._mark_indexes_current()
+        return result
+
+    return wrapper
 
 
 class XMLEditor:
@@ -46,10 +71,22 @@ class XMLEditor:
     of each element. This enables finding nodes by their line number in the original
     file, which is useful when working with Read tool output.
 
+    get_node() looks candidates up in per-tag, per-attribute and per-line indexes
+    that are built on first use and extended by the editing methods, so repeated
+    lookups do not rescan the document. Any other change to elements or
+    attributes, such as a direct setAttribute() or appendChild() call, is
+    detected on the next lookup and the indexes are rebuilt from the DOM.
+
+    Element text used by contains= lookups is cached per element and dropped for
+    the ancestors of every edit made through the editing methods, and matches are
+    confirmed against the live DOM. Text changed by editing text nodes directly
+    is not detected, so such text may be missed until the indexes are rebuilt.
+
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        content_hash: SHA-256 of the file content as last loaded or saved
     """
 
     def __init__(self, xml_path):
@@ -66,12 +103,16 @@ class XMLEditor:
         if not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
 
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        content = self.xml_path.read_bytes()
+        self.content_hash = hashlib.sha256(content).hexdigest()
+
+        header = content[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        self.dom = _LineTrackingBuilder().parseString(content)
+        # Key kept in the document's ID cache while the indexes match the DOM
+        self._index_token = object()
+        self._reset_indexes()
 
     def get_node(
         self,
@@ -90,7 +131,8 @@ class XMLEditor:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
             attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
             line_number: Line number (int) or line range (range) in original XML file (1-indexed)
-            contains: Text string that must appear in any text node within the element.
+            contains: Text string that must appear in the element's text. Text is matched
+                      across child elements, so a w:p matches text split over several runs.
                       Supports both entity notation (&#8220;) and Unicode characters (\u201c).
 
         Returns:
@@ -109,40 +151,36 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        matches = [
+            elem
+            for elem in self._get_candidates(tag, attrs, line_number)
+            if self._matches(
+                elem, attrs, line_number, normalized_contains, self._get_cached_text
+            )
+            and self._is_attached(elem)
+        ]
+        if normalized_contains is not None:
+            # Cached text is stale if the DOM was edited directly; confirm matches
+            matches = [
+                elem
+                for elem in matches
+                if normalized_contains in self._get_element_text(elem)
+            ]
+        if not matches:
+            # The indexes miss nodes added or changed through direct DOM access
+            matches = [
+                elem
+                for elem in self.dom.getElementsByTagName(tag)
+                if self._matches(
+                    elem, attrs, line_number, normalized_contains, self._get_element_text
+                )
+            ]
+            if matches:
+                self._reset_indexes()
 
         if not matches:
             # Build descriptive error message
@@ -164,7 +202,9 @@ class XMLEditor:
 
             # Add helpful hint based on filters used
             if contains:
-                hint = "Text may be split across elements or use different wording."
+                hint = self._get_split_text_hint(tag, normalized_contains) or (
+                    "Text may be split across elements or use different wording."
+                )
             elif line_number:
                 hint = "Line numbers may have changed if document was modified."
             elif attrs:
@@ -180,12 +220,224 @@ class XMLEditor:
             )
         return matches[0]
 
+    def _matches(self, elem, attrs, line_number, contains, get_text):
+        """Check whether an element passes all get_node filters.
+
+        get_text is the function used to extract element text for contains.
+        """
+        # Check line_number filter
+        if line_number is not None:
+            parse_pos = getattr(elem, "parse_position", (None,))
+            elem_line = parse_pos[0]
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                elem.getAttribute(attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Check contains filter
+        if contains is not None:
+            if contains not in get_text(elem):
+                return False
+
+        return True
+
+    def _get_split_text_hint(self, tag, contains):
+        """Explain a failed contains lookup whose text only exists across several elements.
+
+        Returns:
+            str or None: Hint naming the paragraphs containing the text, if any
+        """
+        if tag == "w:p":
+            return None
+        paragraphs = [
+            para
+            for para in self._get_candidates("w:p", None, None)
+            if contains in self._get_cached_text(para) and self._is_attached(para)
+        ]
+        if not paragraphs:
+            return None
+        lines = [
+            str(para.parse_position[0])
+            for para in paragraphs
+            if hasattr(para, "parse_position")
+        ]
+        location = f" at line {', '.join(lines)}" if lines else ""
+        return (
+            f"Text is split across several <{tag}> elements in <w:p>{location}. "
+            f'Use tag="w:p" or search for a shorter string.'
+        )
+
+    def _get_candidates(self, tag, attrs, line_number):
+        """
+        Get the elements that may match a get_node query.
+
+        Uses the attribute index when attrs are given, the line index when a
+        line_number is given, and the tag index otherwise.
+
+        Returns:
+            Candidate elements, still to be checked with _matches and _is_attached
+        """
+        if self._dom_changed():
+            self._reset_indexes()
+        self._index_pending_nodes()
+
+        if attrs:
+            attr_name, attr_value = next(iter(attrs.items()))
+            return self._get_attr_index(tag, attr_name).get(attr_value, ())
+        if line_number is not None:
+            lines, elements = self._get_line_index(tag)
+            if isinstance(line_number, range):
+                if not line_number:
+                    return ()
+                start = bisect_left(lines, min(line_number))
+                stop = bisect_right(lines, max(line_number))
+            else:
+                start = bisect_left(lines, line_number)
+                stop = bisect_right(lines, line_number)
+            return elements[start:stop]
+        return self._get_tag_index(tag)
+
+    def _reset_indexes(self):
+        """Drop all lookup indexes so they are rebuilt on next use."""
+        # tag -> {element: None}, an insertion-ordered set
+        self._tag_index = {}
+        # (tag, attribute name) -> {attribute value: {element: None}}
+        self._attr_index = {}
+        # tag -> (sorted line numbers, elements in the same order)
+        self._line_index = {}
+        # Nodes inserted by the editing methods since the last lookup
+        self._pending_nodes = []
+        # element -> text, see _get_cached_text
+        self._text_cache = {}
+        self._mark_indexes_current()
+
+    def _mark_indexes_current(self):
+        """Record that the lookup indexes match the DOM as it is now.
+
+        minidom clears the document's ID cache whenever an element is added or
+        removed or an attribute changes, so the token stored there disappears
+        with the first such change.
+        """
+        id_cache = getattr(self.dom, "_id_cache", None)
+        if isinstance(id_cache, dict):
+            id_cache[self._index_token] = None
+
+    def _dom_changed(self):
+        """Check whether the DOM may have changed since _mark_indexes_current."""
+        id_cache = getattr(self.dom, "_id_cache", None)
+        return not isinstance(id_cache, dict) or self._index_token not in id_cache
+
+    def _get_tag_index(self, tag):
+        """Get the set of elements with a tag, building it on first use."""
+        if tag not in self._tag_index:
+            self._tag_index[tag] = dict.fromkeys(self.dom.getElementsByTagName(tag))
+        return self._tag_index[tag]
+
+    def _get_attr_index(self, tag, attr_name):
+        """Get elements with a tag grouped by an attribute value, building it on first use."""
+        key = (tag, attr_name)
+        if key not in self._attr_index:
+            by_value = {}
+            for elem in self._get_tag_index(tag):
+                by_value.setdefault(elem.getAttribute(attr_name), {})[elem] = None
+            self._attr_index[key] = by_value
+        return self._attr_index[key]
+
+    def _get_line_index(self, tag):
+        """Get elements with a tag sorted by original line, building it on first use.
+
+        Only elements from the original file have a parse_position, and it never
+        changes, so this index does not need updating after edits.
+        """
+        if tag not in self._line_index:
+            positioned = sorted(
+                (
+                    (elem.parse_position[0], order, elem)
+                    for order, elem in enumerate(self._get_tag_index(tag))
+                    if hasattr(elem, "parse_position")
+                ),
+                key=lambda item: item[:2],
+            )
+            self._line_index[tag] = (
+                [line for line, _, _ in positioned],
+                [elem for _, _, elem in positioned],
+            )
+        return self._line_index[tag]
+
+    def _track_new_nodes(self, nodes):
+        """Queue inserted nodes to be added to the lookup indexes on next lookup.
+
+        Indexing is deferred so attributes set right after insertion (like the
+        IDs DocxXMLEditor injects) are indexed with their final values. The
+        cached text of the nodes' ancestors is dropped right away.
+        """
+        self._pending_nodes.extend(nodes)
+        for node in nodes:
+            parent = node.parentNode
+            while parent is not None:
+                self._text_cache.pop(parent, None)
+                parent = parent.parentNode
+
+    def _index_pending_nodes(self):
+        """Add queued nodes and their descendants to the indexes built so far."""
+        if not self._pending_nodes:
+            return
+        attr_names_by_tag = {}
+        for tag, attr_name in self._attr_index:
+            attr_names_by_tag.setdefault(tag, []).append(attr_name)
+
+        for node in self._pending_nodes:
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for elem in [node, *node.getElementsByTagName("*")]:
+                tag_index = self._tag_index.get(elem.tagName)
+                if tag_index is None:
+                    continue
+                tag_index[elem] = None
+                for attr_name in attr_names_by_tag.get(elem.tagName, ()):
+                    by_value = self._attr_index[(elem.tagName, attr_name)]
+                    by_value.setdefault(elem.getAttribute(attr_name), {})[elem] = None
+        self._pending_nodes = []
+
+    def _is_attached(self, node):
+        """Check whether a node is still part of this editor's document."""
+        while node.parentNode is not None:
+            node = node.parentNode
+        return node is self.dom
+
+    def _get_cached_text(self, elem):
+        """Get the text of an element like _get_element_text, caching it for all descendants."""
+        text = self._text_cache.get(elem)
+        if text is None:
+            text_parts = []
+            for node in elem.childNodes:
+                if node.nodeType == node.TEXT_NODE:
+                    if node.data.strip() or elem.tagName in TEXT_ELEMENTS:
+                        text_parts.append(node.data)
+                elif node.nodeType == node.ELEMENT_NODE:
+                    text_parts.append(self._get_cached_text(node))
+            text = self._text_cache[elem] = "".join(text_parts)
+        return text
+
     def _get_element_text(self, elem):
         """
         Recursively extract all text content from an element.
 
         Skips text nodes that contain only whitespace (spaces, tabs, newlines),
-        which typically represent XML formatting rather than document content.
+        which typically represent XML formatting rather than document content,
+        unless they are inside a text element such as w:t.
 
         Args:
             elem: defusedxml.minidom.Element to extract text from
@@ -197,12 +449,13 @@ class XMLEditor:
         for node in elem.childNodes:
             if node.nodeType == node.TEXT_NODE:
                 # Skip whitespace-only text nodes (XML formatting)
-                if node.data.strip():
+                if node.data.strip() or elem.tagName in TEXT_ELEMENTS:
                     text_parts.append(node.data)
             elif node.nodeType == node.ELEMENT_NODE:
                 text_parts.append(self._get_element_text(node))
         return "".join(text_parts)
 
+    @_keeps_indexes
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
@@ -217,13 +470,11 @@ class XMLEditor:
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
+        self._place_nodes("replace_node", elem, nodes)
         return nodes
 
+    @_keeps_indexes
     def insert_after(self, elem, xml_content):
         """
         Insert XML content after a DOM element.
@@ -238,16 +489,11 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+        self._place_nodes("insert_after", elem, nodes)
         return nodes
 
+    @_keeps_indexes
     def insert_before(self, elem, xml_content):
         """
         Insert XML content before a DOM element.
@@ -262,12 +508,11 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
+        self._place_nodes("insert_before", elem, nodes)
         return nodes
 
+    @_keeps_indexes
     def append_to(self, elem, xml_content):
         """
         Append XML content as a child of a DOM element.
@@ -283,8 +528,7 @@ class XMLEditor:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        self._place_nodes("append_to", elem, nodes)
         return nodes
 
     def get_next_rid(self):
@@ -304,10 +548,42 @@ class XMLEditor:
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8), and updates
+        content_hash so callers can tell whether the file changed.
         """
         content = self.dom.toxml(encoding=self.encoding)
         self.xml_path.write_bytes(content)
+        self.content_hash = hashlib.sha256(content).hexdigest()
+
+    def _place_nodes(self, operation, elem, nodes):
+        """
+        Put already imported nodes into the document relative to a DOM element.
+
+        Args:
+            operation: One of "replace_node", "insert_after", "insert_before", "append_to"
+            elem: defusedxml.minidom.Element the operation applies to
+            nodes: Nodes returned by _parse_fragment or _parse_fragments
+        """
+        if operation == "append_to":
+            for node in nodes:
+                elem.appendChild(node)
+        elif operation == "insert_after":
+            parent = elem.parentNode
+            next_sibling = elem.nextSibling
+            for node in nodes:
+                if next_sibling:
+                    parent.insertBefore(node, next_sibling)
+                else:
+                    parent.appendChild(node)
+        elif operation in ("insert_before", "replace_node"):
+            parent = elem.parentNode
+            for node in nodes:
+                parent.insertBefore(node, elem)
+            if operation == "replace_node":
+                parent.removeChild(elem)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+        self._track_new_nodes(nodes)
 
     def _parse_fragment(self, xml_content):
         """
@@ -322,6 +598,24 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, xml_contents):
+        """
+        Parse several XML fragments with a single parser run.
+
+        Args:
+            xml_contents: List of strings containing XML fragments
+
+        Returns:
+            List with one list of imported defusedxml.minidom.Node objects per fragment
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+        """
+        if not xml_contents:
+            return []
+
         # Extract namespace declarations from the root document element
         root_elem = self.dom.documentElement
         namespaces = []
@@ -332,43 +626,33 @@ class XMLEditor:
                     namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
 
         ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
+        body = "".join(f"<fragment>{content}</fragment>" for content in xml_contents)
+        wrapper = f"<root {ns_decl}>{body}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
-        return nodes
 
+        fragments = []
+        for fragment in fragment_doc.documentElement.childNodes:  # type: ignore
+            nodes = [
+                self.dom.importNode(child, deep=True) for child in fragment.childNodes
+            ]
+            elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
+            assert elements, "Fragment must contain at least one element"
+            fragments.append(nodes)
+        return fragments
 
-def _create_line_tracking_parser():
-    """
-    Create a SAX parser that tracks line and column numbers for each element.
-
-    Monkey patches the SAX content handler to store the current line and column
-    position from the underlying expat parser onto each element as a parse_position
-    attribute (line, column) tuple.
 
-    Returns:
-        defusedxml.sax.xmlreader.XMLReader: Configured SAX parser
+class _LineTrackingBuilder(defusedxml.expatbuilder.DefusedExpatBuilderNS):
     """
+    DOM builder that records the line and column number of each element.
 
-    def set_content_handler(dom_handler):
-        def startElementNS(name, tagName, attrs):
-            orig_start_cb(name, tagName, attrs)
-            cur_elem = dom_handler.elementStack[-1]
-            cur_elem.parse_position = (
-                parser._parser.CurrentLineNumber,  # type: ignore
-                parser._parser.CurrentColumnNumber,  # type: ignore
-            )
-
-        orig_start_cb = dom_handler.startElementNS
-        dom_handler.startElementNS = startElementNS
-        orig_set_content_handler(dom_handler)
+    Builds the minidom tree directly from expat (much faster than going through
+    SAX and pulldom) and stores the position of each start tag on the element as
+    a parse_position attribute (line, column) tuple.
+    """
 
-    parser = defusedxml.sax.make_parser()
-    orig_set_content_handler = parser.setContentHandler
-    parser.setContentHandler = set_content_handler  # type: ignore
-    return parser
+    def start_element_handler(self, name, attributes):
+        super().start_element_handler(name, attributes)
+        self.curNode.parse_position = (  # type: ignore
+            self._parser.CurrentLineNumber,  # type: ignore
+            self._parser.CurrentColumnNumber,  # type: ignore
+        )
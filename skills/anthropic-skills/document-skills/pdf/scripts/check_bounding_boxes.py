@@ -1,4 +1,6 @@
+from collections import defaultdict
 from dataclasses import dataclass
+import heapq
 import json
 import sys
 
@@ -14,36 +16,66 @@ class RectAndField:
     field: dict
 
 
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+# Returns a dict mapping each index in `rects_and_fields` to the sorted indices of
+# later rects on the same page that intersect it. Rects are bucketed by page, and
+# within a page a sweep over x only tests pairs whose horizontal extents overlap.
+def find_intersections(rects_and_fields) -> dict[int, list[int]]:
+    pages = defaultdict(list)
+    for i, rf in enumerate(rects_and_fields):
+        pages[rf.field["page_number"]].append(i)
+
+    intersections = defaultdict(list)
+    for indices in pages.values():
+        indices.sort(key=lambda i: rects_and_fields[i].rect[0])
+        active = set()
+        # Active rects by right edge, so rects entirely to the left of the sweep can be dropped
+        right_edges = []
+        for i in indices:
+            rect = rects_and_fields[i].rect
+            while right_edges and right_edges[0][0] <= rect[0]:
+                active.discard(heapq.heappop(right_edges)[1])
+            for j in active:
+                if rects_intersect(rect, rects_and_fields[j].rect):
+                    intersections[min(i, j)].append(max(i, j))
+            active.add(i)
+            heapq.heappush(right_edges, (rect[2], i))
+
+    for partners in intersections.values():
+        partners.sort()
+    return intersections
+
+
 # Returns a list of messages that are printed to stdout for Claude to read.
 def get_bounding_box_messages(fields_json_stream) -> list[str]:
     messages = []
     fields = json.load(fields_json_stream)
     messages.append(f"Read {len(fields['form_fields'])} fields")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
-
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
+    # Messages are reported in the same order as comparing every pair (i, j > i) would.
+    intersections = find_intersections(rects_and_fields)
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in intersections.get(i, []):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            has_error = True
+            if ri.field is rj.field:
+                messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+            else:
+                messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+            if len(messages) >= 20:
+                messages.append("Aborting further checks; fix bounding boxes and try again")
+                return messages
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
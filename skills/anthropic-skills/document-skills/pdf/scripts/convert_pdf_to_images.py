@@ -1,35 +1,68 @@
+import math
 import os
 import sys
 
 from pdf2image import convert_from_path
+from pypdf import PdfReader
 
 
 # Converts each page of a PDF to a PNG image.
+# Pages are rendered a few at a time and directly at their final size, so memory
+# use stays the same however many pages the PDF has.
 
+RENDER_DPI = 200
+PAGES_PER_JOB = 4  # Pages each pdftoppm process renders per chunk
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
+def iter_page_images(pdf_path, max_dim=1000, jobs=1):
+    # Yields (page number, image) in page order. Each chunk of pages is split
+    # across `jobs` pdftoppm processes (pdf2image's thread_count).
+    reader = PdfReader(pdf_path)
+    page_sizes = [(float(page.mediabox.width), float(page.mediabox.height)) for page in reader.pages]
+    for first_page, last_page, scaled in page_chunks(page_sizes, max_dim, max(1, jobs) * PAGES_PER_JOB):
+        images = convert_from_path(
+            pdf_path,
+            dpi=RENDER_DPI,
+            first_page=first_page,
+            last_page=last_page,
+            thread_count=jobs,
+            # Renders with the longest side at `max_dim` instead of resizing afterwards
+            size=max_dim if scaled else None,
+        )
+        for page_number, image in enumerate(images, first_page):
+            yield page_number, image
+
+
+def page_chunks(page_sizes, max_dim, chunk_size):
+    # Groups consecutive pages into [first, last, scaled] ranges of at most
+    # `chunk_size` pages, where `scaled` is whether the pages would be larger
+    # than `max_dim` at RENDER_DPI (page sizes are in points).
+    chunks = []
+    for page_number, (width, height) in enumerate(page_sizes, 1):
+        scaled = math.ceil(max(width, height) * RENDER_DPI / 72) > max_dim
+        if chunks and chunks[-1][2] == scaled and page_number - chunks[-1][0] < chunk_size:
+            chunks[-1][1] = page_number
+        else:
+            chunks.append([page_number, page_number, scaled])
+    return chunks
+
+
+def convert(pdf_path, output_dir, max_dim=1000, jobs=1):
+    page_count = 0
+    for page_number, image in iter_page_images(pdf_path, max_dim, jobs):
+        image_path = os.path.join(output_dir, f"page_{page_number}.png")
         image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
+        print(f"Saved page {page_number} as {image_path} (size: {image.size})")
+        page_count += 1
 
-    print(f"Converted {len(images)} pages to PNG images")
+    print(f"Converted {page_count} pages to PNG images")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: convert_pdf_to_images.py [input pdf] [output directory] [parallel jobs (default 1)]")
         sys.exit(1)
     pdf_path = sys.argv[1]
     output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
+    jobs = int(sys.argv[3]) if len(sys.argv) == 4 else 1
+    convert(pdf_path, output_directory, jobs=jobs)
@@ -1,29 +1,143 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--jobs N]
+    python unpack.py <office_file> <output_dir> --parts "ppt/slides/*.xml"
+"""
+
+import argparse
+import fnmatch
+import json
 import random
-import sys
+import shutil
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+# Written by a selective unpack; lists the members left in the original file
+SIDECAR_NAME = ".ooxml-source.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file")
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Output directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for pretty-printing XML parts (default: 1)",
+    )
+    parser.add_argument(
+        "--parts",
+        nargs="+",
+        metavar="GLOB",
+        help="Only unpack parts matching these globs (e.g. 'ppt/slides/*.xml'); "
+        "other parts stay in the original file and are restored by pack.py",
+    )
+    args = parser.parse_args()
+
+    unpack_document(args.input_file, args.output_dir, jobs=args.jobs, parts=args.parts)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=1, parts=None):
+    """Unpack an Office file into a directory with pretty-printed XML.
+
+    Members are streamed out of the zip one at a time: XML and .rels parts are
+    pretty-printed in memory before being written, other files are copied as-is.
+
+    With parts, only members matching one of the globs are unpacked, along with
+    [Content_Types].xml and all .rels files. The remaining members are listed in
+    a sidecar file that points back to input_file, and pack_document copies them
+    from there unchanged.
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to unpack into
+        jobs: Number of processes used to pretty-print XML parts (default: 1)
+        parts: Optional list of glob patterns for the parts to unpack
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    sidecar = output_path / SIDECAR_NAME
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+
+        if parts is None:
+            sidecar.unlink(missing_ok=True)
+        else:
+            selected, skipped = [], []
+            for info in members:
+                (selected if is_selected(info.filename, parts) else skipped).append(info)
+            # CRCs let pack.py detect a source file that changed since unpacking
+            reference = {
+                "source": str(Path(input_file).resolve()),
+                "members": {info.filename: info.CRC for info in skipped},
+            }
+            sidecar.write_text(json.dumps(reference, indent=2) + "\n")
+            members = selected
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
+        xml_members = [info for info in members if is_xml_part(info.filename)]
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
+        # Copy binary parts straight from the archive
+        for info in members:
+            if not is_xml_part(info.filename):
+                target = member_path(output_path, info.filename)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as source, open(target, "wb") as dest:
+                    shutil.copyfileobj(source, dest)
+
+        # Pretty print all XML parts, in parallel if requested (results keep order)
+        contents = (zf.read(info) for info in xml_members)
+        if jobs > 1 and len(xml_members) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                chunksize = max(1, len(xml_members) // (jobs * 4))
+                pretty = list(executor.map(pretty_print_xml, contents, chunksize=chunksize))
+        else:
+            pretty = map(pretty_print_xml, contents)
+
+        for info, content in zip(xml_members, pretty):
+            target = member_path(output_path, info.filename)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+
+
+def pretty_print_xml(content):
+    """Pretty print an XML document given as bytes."""
     dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def is_selected(name, parts):
+    """Check whether a member is unpacked by a selective unpack."""
+    if name == "[Content_Types].xml" or name.endswith(".rels"):
+        return True
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in parts)
+
+
+def is_xml_part(name):
+    """Check whether a part name refers to an XML or .rels part."""
+    return name.endswith((".xml", ".rels"))
+
+
+def member_path(output_path, name):
+    """Map a zip member name to a path inside output_path.
+
+    Like ZipFile.extract, absolute paths and ".." components are dropped so a
+    member can never be written outside output_path.
+    """
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+    return output_path.joinpath(*parts)
+
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
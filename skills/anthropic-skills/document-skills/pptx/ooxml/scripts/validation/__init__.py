@@ -4,12 +4,18 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .original import OriginalPackage, get_original_package
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .rules import Rule, run_rules
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "OriginalPackage",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "Rule",
+    "get_original_package",
+    "run_rules",
 ]
@@ -0,0 +1,134 @@
+"""
+Single-pass rule engine for element-level checks on document XML files.
+
+Rules declare the element tags or namespaces they are interested in. The engine
+walks each XML file once and dispatches every element to the interested rules,
+so adding a rule does not add another parse or tree walk.
+"""
+
+
+class Rule:
+    """Base class for element-level checks run by run_rules.
+
+    Subclasses set either `tags` to the Clark-notation tags ("{namespace}local")
+    or `namespaces` to the namespace URIs they want to visit, and override
+    visit() to record errors. Leaving both empty visits every element.
+
+    Elements are visited when their end tag is reached, so an element's text,
+    children and ancestors are all available inside visit().
+
+    Attributes:
+        validator: The BaseSchemaValidator the rule runs for
+        errors: Formatted error lines collected so far
+        files_checked: Number of XML files the rule was applied to
+    """
+
+    tags = frozenset()
+    namespaces = frozenset()
+
+    # Report messages; {count} is replaced with the number of errors
+    failure_message = "FAILED - Found {count} violations:"
+    success_message = "PASSED - No violations found"
+    # Message used instead of success_message when no file matched applies_to
+    empty_message = None
+    # Extra lines printed after the errors of a failed rule
+    failure_hints = ()
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.files_checked = 0
+
+    def applies_to(self, xml_file):
+        """Return True if this rule should run on xml_file."""
+        return True
+
+    def start_file(self, xml_file):
+        """Prepare for a new file. Return False to skip this file."""
+        return True
+
+    def visit(self, elem, xml_file):
+        """Check a single element of xml_file."""
+        raise NotImplementedError("Subclasses must implement the visit method")
+
+    def end_file(self, xml_file):
+        """Finish checking xml_file."""
+
+    def add_error(self, xml_file, message):
+        """Record an error for xml_file, prefixed with its relative path."""
+        self.errors.append(
+            f"  {xml_file.relative_to(self.validator.unpacked_dir)}: {message}"
+        )
+
+    def report(self):
+        """Print the outcome of the rule and return True if it passed."""
+        if self.errors:
+            print(self.failure_message.format(count=len(self.errors)))
+            for error in self.errors:
+                print(error)
+            for hint in self.failure_hints:
+                print(hint)
+            return False
+        if self.validator.verbose:
+            if self.empty_message and not self.files_checked:
+                print(self.empty_message)
+            else:
+                print(self.success_message)
+        return True
+
+
+def run_rules(validator, rules):
+    """Run rules over validator.xml_files with one walk per XML file.
+
+    Args:
+        validator: BaseSchemaValidator providing xml_files and parsed trees
+        rules: List of Rule instances
+
+    Returns:
+        list: The same rules, with their errors collected
+    """
+    for xml_file in validator.xml_files:
+        active = [
+            rule
+            for rule in rules
+            if rule.applies_to(xml_file) and rule.start_file(xml_file)
+        ]
+        if not active:
+            continue
+
+        # Build the dispatch tables for this file
+        by_tag = {}
+        by_namespace = {}
+        visit_all = []
+        for rule in active:
+            rule.files_checked += 1
+            for tag in rule.tags:
+                by_tag.setdefault(tag, []).append(rule)
+            for namespace in rule.namespaces:
+                by_namespace.setdefault(namespace, []).append(rule)
+            if not rule.tags and not rule.namespaces:
+                visit_all.append(rule)
+
+        try:
+            for elem in validator._iter_elements(xml_file):
+                for rule in by_tag.get(elem.tag, ()):
+                    rule.visit(elem, xml_file)
+                if by_namespace and elem.tag.startswith("{"):
+                    namespace = elem.tag[1:].split("}", 1)[0]
+                    for rule in by_namespace.get(namespace, ()):
+                        rule.visit(elem, xml_file)
+                for rule in visit_all:
+                    rule.visit(elem, xml_file)
+        except Exception as e:
+            for rule in active:
+                rule.add_error(xml_file, f"Error: {e}")
+            continue
+
+        for rule in active:
+            rule.end_file(xml_file)
+
+    return rules
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
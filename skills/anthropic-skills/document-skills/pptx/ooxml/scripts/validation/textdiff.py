@@ -0,0 +1,284 @@
+"""
+In-process text diff used to report redlining mismatches.
+
+Paragraphs are aligned first, so only paragraphs that differ are compared
+character by character. Character diffs use Myers' algorithm; when two
+paragraphs differ too much for a readable character diff, the comparison falls
+back to whole words, like git's word diff, and paragraphs that differ in too
+many words as well are reported as one replaced block.
+"""
+
+import re
+
+# Character diffs with more edits than this are redone on words
+MAX_CHAR_EDITS = 200
+
+# Word diffs with more edits than this are reported as one replaced block
+MAX_WORD_EDITS = 200
+
+# Paragraph alignments with more edits than this are reported as one block
+MAX_PARAGRAPH_EDITS = 2000
+
+# Words and the whitespace between them, used by the word-level fallback
+_WORD_PATTERN = re.compile(r"\s+|\S+")
+
+
+class Hunk:
+    """A changed span within a paragraph.
+
+    Offsets are character positions in the original and modified paragraph.
+
+    Attributes:
+        original_start, original_end: Span of the removed text in the original
+        modified_start, modified_end: Span of the added text in the modified text
+        removed: Text removed from the original (may be empty)
+        added: Text added in the modified version (may be empty)
+    """
+
+    def __init__(self, original_start, original_end, modified_start, modified_end, removed, added):
+        self.original_start = original_start
+        self.original_end = original_end
+        self.modified_start = modified_start
+        self.modified_end = modified_end
+        self.removed = removed
+        self.added = added
+
+    def __repr__(self):
+        return f"Hunk({self.original_start}, {self.modified_start}, -{self.removed!r}, +{self.added!r})"
+
+
+class ParagraphDiff:
+    """Differences between one original paragraph and its modified counterpart.
+
+    A paragraph that was only added or only removed has None for the missing
+    side's index and a single hunk covering the whole text.
+
+    Attributes:
+        original_index: Position of the paragraph in the original, or None
+        modified_index: Position of the paragraph in the modified text, or None
+        original: Original paragraph text ("" if the paragraph was added)
+        modified: Modified paragraph text ("" if the paragraph was removed)
+        hunks: List of Hunk objects in paragraph order
+    """
+
+    def __init__(self, original_index, modified_index, original, modified, hunks):
+        self.original_index = original_index
+        self.modified_index = modified_index
+        self.original = original
+        self.modified = modified
+        self.hunks = hunks
+
+    def format(self):
+        """Render the paragraph in git's plain word-diff style ([-removed-]{+added+})."""
+        parts = []
+        position = 0
+        for hunk in self.hunks:
+            parts.append(self.original[position : hunk.original_start])
+            if hunk.removed:
+                parts.append(f"[-{hunk.removed}-]")
+            if hunk.added:
+                parts.append(f"{{+{hunk.added}+}}")
+            position = hunk.original_end
+        parts.append(self.original[position:])
+        return "".join(parts)
+
+
+def diff_paragraphs(original_paragraphs, modified_paragraphs):
+    """Compare two lists of paragraph texts.
+
+    Args:
+        original_paragraphs: List of paragraph strings from the original
+        modified_paragraphs: List of paragraph strings from the modified document
+
+    Returns:
+        list: ParagraphDiff objects for every paragraph that differs, in order
+    """
+    opcodes = diff_sequences(original_paragraphs, modified_paragraphs, MAX_PARAGRAPH_EDITS)
+    if opcodes is None:
+        opcodes = [("replace", 0, len(original_paragraphs), 0, len(modified_paragraphs))]
+
+    changes = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        # Pair up the paragraphs of a changed block; leftovers were added or removed
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired):
+            original = original_paragraphs[i1 + offset]
+            modified = modified_paragraphs[j1 + offset]
+            changes.append(
+                ParagraphDiff(i1 + offset, j1 + offset, original, modified, diff_text(original, modified))
+            )
+        for index in range(i1 + paired, i2):
+            text = original_paragraphs[index]
+            changes.append(ParagraphDiff(index, None, text, "", [Hunk(0, len(text), 0, 0, text, "")]))
+        for index in range(j1 + paired, j2):
+            text = modified_paragraphs[index]
+            changes.append(ParagraphDiff(None, index, "", text, [Hunk(0, 0, 0, len(text), "", text)]))
+    return changes
+
+
+def diff_text(original, modified):
+    """Return the hunks that turn original into modified.
+
+    The diff is done per character, or per word when the character diff would
+    need more than MAX_CHAR_EDITS edits. When the word diff would need more
+    than MAX_WORD_EDITS edits too, the whole paragraph is one replace hunk.
+    """
+    opcodes = diff_sequences(original, modified, MAX_CHAR_EDITS)
+    if opcodes is not None:
+        return _opcodes_to_hunks(opcodes, original, modified, None, None)
+
+    original_words = _WORD_PATTERN.findall(original)
+    modified_words = _WORD_PATTERN.findall(modified)
+    opcodes = diff_sequences(original_words, modified_words, MAX_WORD_EDITS)
+    if opcodes is None:
+        return [Hunk(0, len(original), 0, len(modified), original, modified)]
+    return _opcodes_to_hunks(
+        opcodes, original, modified, _offsets(original_words), _offsets(modified_words)
+    )
+
+
+def diff_sequences(a, b, max_edits=None):
+    """Compute a minimal edit script between two sequences using Myers' algorithm.
+
+    Args:
+        a: Original sequence (string or list of hashable items)
+        b: Modified sequence
+        max_edits: Give up and return None if more insertions plus deletions
+            than this are needed (default: no limit)
+
+    Returns:
+        list: difflib-style opcodes (tag, i1, i2, j1, j2) with tags "equal",
+            "replace", "delete" and "insert", or None if max_edits was exceeded
+    """
+    # Common prefix and suffix never need the search below
+    n, m = len(a), len(b)
+    start = 0
+    while start < n and start < m and a[start] == b[start]:
+        start += 1
+    end_a, end_b = n, m
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    edits = _myers(a[start:end_a], b[start:end_b], max_edits)
+    if edits is None:
+        return None
+
+    # Merge the single-item edits into runs, shifted back to full positions
+    opcodes = []
+    if start:
+        opcodes.append(("equal", 0, start, 0, start))
+    x = y = 0
+    for tag, count in edits:
+        i, j = start + x, start + y
+        if tag == "equal":
+            opcodes.append(("equal", i, i + count, j, j + count))
+            x += count
+            y += count
+        elif tag == "delete":
+            opcodes.append(("delete", i, i + count, j, j))
+            x += count
+        else:
+            opcodes.append(("insert", i, i, j, j + count))
+            y += count
+    if end_a < n:
+        opcodes.append(("equal", end_a, n, end_b, m))
+    return _merge_replacements(opcodes)
+
+
+def _myers(a, b, max_edits):
+    """Return the shortest edit script for a -> b as (tag, count) runs, or None."""
+    n, m = len(a), len(b)
+    if not n or not m:
+        if max_edits is not None and n + m > max_edits:
+            return None
+        return ([("delete", n)] if n else []) + ([("insert", m)] if m else [])
+
+    limit = n + m if max_edits is None else min(n + m, max_edits)
+    # v[k] is the furthest x reached on diagonal k; trace keeps v for each d
+    v = {1: 0}
+    trace = []
+    for d in range(limit + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    """Walk the Myers trace back from (x, y) and return (tag, count) runs."""
+    steps = []
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            previous_k, tag = k + 1, "insert"
+        else:
+            previous_k, tag = k - 1, "delete"
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        # The diagonal run after the edit that led here
+        snake = x - previous_x - (tag == "delete")
+        if snake > 0:
+            steps.append(("equal", snake))
+        steps.append((tag, 1))
+        x, y = previous_x, previous_y
+    if x > 0:
+        steps.append(("equal", x))
+
+    runs = []
+    for tag, count in reversed(steps):
+        if runs and runs[-1][0] == tag:
+            runs[-1] = (tag, runs[-1][1] + count)
+        else:
+            runs.append((tag, count))
+    return runs
+
+
+def _merge_replacements(opcodes):
+    """Combine adjacent delete and insert opcodes into replace opcodes."""
+    merged = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if merged and tag != "equal" and merged[-1][0] != "equal":
+            _, previous_i1, _, previous_j1, _ = merged[-1]
+            merged[-1] = ("replace", previous_i1, i2, previous_j1, j2)
+        else:
+            merged.append((tag, i1, i2, j1, j2))
+    return merged
+
+
+def _offsets(tokens):
+    """Return the character offset of every token boundary (len(tokens) + 1 values)."""
+    offsets = [0]
+    for token in tokens:
+        offsets.append(offsets[-1] + len(token))
+    return offsets
+
+
+def _opcodes_to_hunks(opcodes, original, modified, original_offsets, modified_offsets):
+    """Convert opcodes into Hunks, mapping token positions to characters if needed."""
+    hunks = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        if original_offsets is not None:
+            i1, i2 = original_offsets[i1], original_offsets[i2]
+            j1, j2 = modified_offsets[j1], modified_offsets[j2]
+        hunks.append(Hunk(i1, i2, j1, j2, original[i1:i2], modified[j1:j2]))
+    return hunks
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -38,17 +38,28 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+Rendered slides and grid tiles are cached by content (see RenderCache), so a
+second run only converts the slides that changed since the last one.
 """
 
 import argparse
+import hashlib
+import io
+import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import lxml.etree
 from inventory import extract_text_inventory
+from office_server import convert_document
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -62,6 +73,19 @@ GRID_PADDING = 20  # Padding between thumbnails
 BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
+# JPEGs are decoded at reduced size, at least this many times the tile size,
+# which keeps the LANCZOS downscale sharp (same margin as Image.thumbnail)
+TILE_DECODE_OVERSAMPLE = 2
+TILE_WORKERS = min(8, os.cpu_count() or 1)  # Threads decoding and scaling tiles
+
+# Render cache constants
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "pptx-thumbnails"
+)
+CACHE_VERSION = 2  # Bump when rendering changes so old entries are not reused
+MAX_CACHE_FILES = 2000  # Least recently used files beyond this are removed
+# Relationships that do not change how a slide renders
+UNRENDERED_RELATIONSHIPS = {RT.NOTES_SLIDE, RT.SLIDE, RT.COMMENTS, RT.COMMENT_AUTHORS}
 
 
 def main():
@@ -86,6 +110,23 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of pdftoppm processes for rendering slides (default: 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Directory for cached slide renders (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Render every slide without reading or writing the cache",
+    )
 
     args = parser.parse_args()
 
@@ -118,8 +159,11 @@ def main():
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            # Convert slides to images, reusing cached renders of unchanged slides
+            cache = None if args.no_cache else RenderCache(args.cache_dir)
+            slide_images = convert_to_images(
+                input_path, Path(temp_dir), CONVERSION_DPI, cache, args.jobs
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -134,7 +178,10 @@ def main():
                 output_path,
                 placeholder_regions,
                 slide_dimensions,
+                cache,
             )
+            if cache:
+                cache.prune()
 
             # Print saved files
             print(f"Created {len(grid_files)} grid(s):")
@@ -146,6 +193,127 @@ def main():
         sys.exit(1)
 
 
+class RenderCache:
+    """Content-addressed store of rendered slide images and grid tiles.
+
+    A slide's key hashes its XML together with every part it references
+    (layout, master, theme, media), the presentation settings that affect
+    rendering and the conversion DPI. An unchanged slide keeps its key when
+    other slides are edited, added, removed or reordered.
+
+    Files:
+        <key>.jpg: Slide rendered at the conversion DPI
+        <key>-<width>x<height>[-outlined].png: Grid tile made from that render
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_image(self, key):
+        """Return the cached render for key, or None."""
+        path = self.directory / f"{key}.jpg"
+        if not path.exists():
+            return None
+        path.touch()  # Mark as recently used for prune()
+        return path
+
+    def store_image(self, key, image_path):
+        """Add a rendered slide to the cache and return its cached path."""
+        return self._store(self.directory / f"{key}.jpg", Path(image_path).read_bytes())
+
+    def tile_path(self, image_path, size, outlined):
+        """Return the tile path for a cached render, or None if it is not cached."""
+        image_path = Path(image_path)
+        if image_path.parent != self.directory:
+            return None
+        suffix = "-outlined" if outlined else ""
+        return self.directory / f"{image_path.stem}-{size[0]}x{size[1]}{suffix}.png"
+
+    def store_tile(self, tile_path, tile):
+        """Save a grid tile losslessly, so grids match uncached output."""
+        data = io.BytesIO()
+        tile.save(data, "PNG")
+        self._store(tile_path, data.getvalue())
+
+    def prune(self, max_files=MAX_CACHE_FILES):
+        """Remove the least recently used files beyond max_files."""
+        files = sorted(
+            self.directory.glob("*.*"), key=lambda path: path.stat().st_mtime, reverse=True
+        )
+        for path in files[max_files:]:
+            path.unlink(missing_ok=True)
+
+    def _store(self, target, data):
+        """Write data to target atomically, so concurrent writers never see partial files.
+
+        Each write gets its own temporary file: threads building identical tiles
+        (duplicate slides) store to the same target at the same time.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=f"{target.stem}.", suffix=".tmp", delete=False
+        ) as temp:
+            temp.write(data)
+        os.replace(temp.name, target)
+        return target
+
+
+def get_slide_keys(prs, dpi):
+    """Compute the render cache key of every slide in a presentation.
+
+    Returns a list of hex digests in slide order.
+    """
+    digests = {}
+
+    def part_digest(part):
+        if part.partname not in digests:
+            digests[part.partname] = hashlib.sha256(part.blob).digest()
+        return digests[part.partname]
+
+    # Presentation-wide settings: slide size, default text style and table styles
+    shared = hashlib.sha256(
+        f"{CACHE_VERSION}:{dpi}:{prs.slide_width}x{prs.slide_height}".encode()
+    )
+    default_text_style = prs.part._element.find(qn("p:defaultTextStyle"))
+    if default_text_style is not None:
+        shared.update(lxml.etree.tostring(default_text_style))
+    for rel in prs.part.rels.values():
+        if rel.reltype == RT.TABLE_STYLES and not rel.is_external:
+            shared.update(part_digest(rel.target_part))
+
+    keys = []
+    for slide_num, slide in enumerate(prs.slides, 1):
+        digest = shared.copy()
+        for part in _render_closure(slide.part):
+            digest.update(part_digest(part))
+        # Slide number fields render differently once the slide moves
+        if b'type="slidenum"' in slide.part.blob:
+            digest.update(f"slide-number:{slide_num}".encode())
+        keys.append(digest.hexdigest())
+    return keys
+
+
+def _render_closure(slide_part):
+    """Return the slide part and every part that affects how it renders, in a stable order."""
+    closure = [slide_part]
+    seen = {slide_part.partname}
+    index = 0
+    while index < len(closure):
+        part = closure[index]
+        index += 1
+        for r_id in sorted(part.rels):
+            rel = part.rels[r_id]
+            if rel.is_external or rel.reltype in UNRENDERED_RELATIONSHIPS:
+                continue
+            # Masters list all of their layouts; only the slide's own layout matters
+            if rel.reltype == RT.SLIDE_LAYOUT and part is not slide_part:
+                continue
+            if rel.target_part.partname not in seen:
+                seen.add(rel.target_part.partname)
+                closure.append(rel.target_part)
+    return closure
+
+
 def create_hidden_slide_placeholder(size):
     """Create placeholder image for hidden slides."""
     img = Image.new("RGB", size, color="#F0F0F0")
@@ -194,8 +362,12 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def convert_to_images(pptx_path, temp_dir, dpi, cache=None, jobs=1):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    With a cache, slides whose render is cached are not converted again; if
+    every visible slide is cached, soffice and pdftoppm are not run at all.
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
@@ -212,43 +384,53 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
-    print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
-
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
-
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+    # Visible slides become consecutive PDF pages
+    visible_slides = [
+        slide_num
+        for slide_num in range(1, total_slides + 1)
+        if slide_num not in hidden_slides
+    ]
+
+    # Look up cached renders
+    slide_images = {}  # slide_num -> image path
+    keys = get_slide_keys(prs, dpi) if cache else None
+    if cache:
+        for slide_num in visible_slides:
+            cached = cache.get_image(keys[slide_num - 1])
+            if cached:
+                slide_images[slide_num] = cached
+        if slide_images:
+            print(f"Reusing {len(slide_images)} cached slide images")
+
+    pending_pages = [
+        page
+        for page, slide_num in enumerate(visible_slides, 1)
+        if slide_num not in slide_images
+    ]
+    if pending_pages:
+        # Convert to PDF (through the shared soffice server when it is available)
+        print("Converting to PDF...")
+        try:
+            pdf_path = convert_document(pptx_path, temp_dir, "pdf")
+        except RuntimeError:
+            raise RuntimeError("PDF conversion failed")
+
+        # Convert the needed PDF pages to images
+        print(f"Converting {len(pending_pages)} pages to images at {dpi} DPI...")
+        rendered = render_pdf_pages(pdf_path, pending_pages, dpi, temp_dir, jobs)
+        for page, image_path in rendered.items():
+            slide_num = visible_slides[page - 1]
+            if cache:
+                image_path = cache.store_image(keys[slide_num - 1], image_path)
+            slide_images[slide_num] = image_path
 
     # Create full list with placeholders for hidden slides
     all_images = []
-    visible_idx = 0
 
     # Get placeholder dimensions from first visible slide
+    visible_images = [
+        slide_images[slide_num] for slide_num in visible_slides if slide_num in slide_images
+    ]
     if visible_images:
         with Image.open(visible_images[0]) as img:
             placeholder_size = img.size
@@ -262,15 +444,72 @@ def convert_to_images(pptx_path, temp_dir, dpi):
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
             all_images.append(placeholder_path)
-        else:
+        elif slide_num in slide_images:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images.append(slide_images[slide_num])
 
     return all_images
 
 
+def render_pdf_pages(pdf_path, pages, dpi, output_dir, jobs=1):
+    """Render selected pages of a PDF to JPEG images with pdftoppm.
+
+    Consecutive pages are rendered by one pdftoppm call using -f/-l, and the
+    ranges are split so that up to jobs pdftoppm processes run in parallel.
+
+    Args:
+        pdf_path: PDF file to render
+        pages: Sorted list of 1-based page numbers
+        dpi: Render resolution
+        output_dir: Directory for the images
+        jobs: Number of pdftoppm processes to run at once (default: 1)
+
+    Returns:
+        dict: page number -> image path, for the pages pdftoppm produced
+    """
+    # Split the pages into runs of consecutive pages, at most chunk pages long
+    chunk = max(1, -(-len(pages) // max(1, jobs)))
+    ranges = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1 and page - ranges[-1][0] < chunk:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+
+    def render(page_range):
+        first, last = page_range
+        prefix = output_dir / f"page-{first}"
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-jpeg",
+                "-r",
+                str(dpi),
+                "-f",
+                str(first),
+                "-l",
+                str(last),
+                str(pdf_path),
+                str(prefix),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Image conversion failed")
+        # pdftoppm names files <prefix>-<page>.jpg, zero-padding the page number
+        return {
+            int(path.stem.rsplit("-", 1)[1]): path
+            for path in output_dir.glob(f"page-{first}-*.jpg")
+        }
+
+    rendered = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for images in executor.map(render, ranges):
+            rendered.update(images)
+    return rendered
+
+
 def create_grids(
     image_paths,
     cols,
@@ -278,8 +517,12 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    cache=None,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid.
+
+    With a cache, tiles of cached slide renders are reused across runs.
+    """
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
     grid_files = []
@@ -297,7 +540,13 @@ def create_grids(
 
         # Create grid for this chunk
         grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+            chunk_images,
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            cache,
         )
 
         # Generate output filename
@@ -325,6 +574,7 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    cache=None,
 ):
     """Create thumbnail grid from slide images with optional placeholder outlining."""
     font_size = int(width * FONT_SIZE_RATIO)
@@ -352,85 +602,49 @@ def create_grid(
         # Fall back to basic default font if size parameter not supported
         font = ImageFont.load_default()
 
+    # Decode and scale the tiles in threads (PIL releases the GIL while doing
+    # so); map yields them in order, so only the small tiles wait for pasting
+    def load_tile(item):
+        slide_num, img_path = item
+        regions = (placeholder_regions or {}).get(slide_num)
+        tile_path = cache.tile_path(img_path, (width, height), bool(regions)) if cache else None
+        if tile_path and tile_path.exists():
+            with Image.open(tile_path) as cached_tile:
+                return cached_tile.convert("RGB")
+        tile = create_tile(img_path, (width, height), regions, slide_dimensions)
+        if tile_path:
+            cache.store_tile(tile_path, tile)
+        return tile
+
     # Place thumbnails
-    for i, img_path in enumerate(image_paths):
-        row, col = i // cols, i % cols
-        x = col * width + (col + 1) * GRID_PADDING
-        y_base = (
-            row * (height + font_size + label_padding * 2) + (row + 1) * GRID_PADDING
-        )
+    with ThreadPoolExecutor(max_workers=TILE_WORKERS) as executor:
+        tiles = executor.map(load_tile, enumerate(image_paths, start_slide_num))
+        for i, tile in enumerate(tiles):
+            row, col = i // cols, i % cols
+            x = col * width + (col + 1) * GRID_PADDING
+            y_base = (
+                row * (height + font_size + label_padding * 2) + (row + 1) * GRID_PADDING
+            )
 
-        # Add label with actual slide number
-        label = f"{start_slide_num + i}"
-        bbox = draw.textbbox((0, 0), label, font=font)
-        text_w = bbox[2] - bbox[0]
-        draw.text(
-            (x + (width - text_w) // 2, y_base + label_padding),
-            label,
-            fill="black",
-            font=font,
-        )
+            # Add label with actual slide number
+            label = f"{start_slide_num + i}"
+            bbox = draw.textbbox((0, 0), label, font=font)
+            text_w = bbox[2] - bbox[0]
+            draw.text(
+                (x + (width - text_w) // 2, y_base + label_padding),
+                label,
+                fill="black",
+                font=font,
+            )
 
-        # Add thumbnail below label with proportional spacing
-        y_thumbnail = y_base + label_padding + font_size + label_padding
-
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
+            # Add thumbnail below label with proportional spacing
+            y_thumbnail = y_base + label_padding + font_size + label_padding
+
+            w, h = tile.size
             tx = x + (width - w) // 2
             ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
+            grid.paste(tile, (tx, ty))
+            tile.close()
 
             # Add border
             if BORDER_WIDTH > 0:
@@ -446,5 +660,70 @@ def create_grid(
     return grid
 
 
+def create_tile(img_path, size, regions=None, slide_dimensions=None):
+    """Scale a slide image down to fit size, outlining placeholder regions if given.
+
+    JPEGs are decoded directly at a reduced scale with draft(), so the
+    full-resolution image is never held in memory.
+    """
+    with Image.open(img_path) as img:
+        # Get original dimensions before thumbnail
+        orig_w, orig_h = img.size
+        img.draft(
+            "RGB", (size[0] * TILE_DECODE_OVERSAMPLE, size[1] * TILE_DECODE_OVERSAMPLE)
+        )
+        # Outlines are drawn on the decoded image, which may be smaller
+        decoded_w, decoded_h = img.size
+
+        # Apply placeholder outlines if enabled
+        if regions:
+            # Convert to RGBA for transparency support
+            if img.mode != "RGBA":
+                img = img.convert("RGBA")
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = decoded_w / slide_width_inches
+            y_scale = decoded_h / slide_height_inches
+
+            # Create a highlight overlay
+            overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
+            overlay_draw = ImageDraw.Draw(overlay)
+
+            # Highlight each placeholder region
+            for region in regions:
+                # Convert from inches to pixels in the original image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+
+                # Draw highlight outline with red color and thick stroke
+                # Using a bright red outline instead of fill
+                stroke_width = max(
+                    5, min(orig_w, orig_h) // 150
+                )  # Thicker proportional stroke width
+                stroke_width = max(1, round(stroke_width * decoded_w / orig_w))
+                overlay_draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0, 255),  # Bright red, fully opaque
+                    width=stroke_width,
+                )
+
+            # Composite the overlay onto the image using alpha blending
+            img = Image.alpha_composite(img, overlay)
+            # Convert back to RGB for JPEG saving
+            img = img.convert("RGB")
+
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return img.convert("RGB")
+
+
 if __name__ == "__main__":
     main()
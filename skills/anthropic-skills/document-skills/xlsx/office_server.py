@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Shared LibreOffice conversion server.
+
+Starting soffice costs seconds per call, so scripts that convert or recalculate
+documents go through this module. It keeps one headless soffice running and
+talks to it over a per-user UNO pipe:
+
+- The server is started on first use and left running for later calls and
+  later scripts, until it has been idle for IDLE_TIMEOUT seconds. Requests
+  from several processes are queued with a lock file.
+- The server uses its own user profile, so it never interferes with a desktop
+  LibreOffice or with one-shot soffice runs.
+- Without the UNO Python bindings (python3-uno), with SOFFICE_SERVER=0, or if
+  the server cannot be used, each call falls back to running soffice once.
+
+Example usage:
+    python office_server.py start
+    python office_server.py status
+    python office_server.py stop
+"""
+
+import argparse
+import contextlib
+import fcntl
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
+
+# Named pipe the server accepts UNO connections on; only its owner can connect
+PIPE_NAME = f"soffice-server-{os.getuid()}"
+# Set SOFFICE_SERVER=0 to always run soffice once per call
+SERVER_ENABLED = os.environ.get("SOFFICE_SERVER", "1") != "0"
+# Holds the server's user profile, pid file, queue lock and last use time
+STATE_DIR = Path(tempfile.gettempdir()) / PIPE_NAME
+STARTUP_TIMEOUT = 60  # Seconds to wait for a new server to accept connections
+# Seconds without requests after which the server stops itself
+IDLE_TIMEOUT = int(os.environ.get("SOFFICE_SERVER_IDLE_TIMEOUT", "600"))
+
+# Export filters used when the --convert-to string names none.
+# Maps output extension -> [(document service, filter name)]
+EXPORT_FILTERS = {
+    "pdf": [
+        ("com.sun.star.text.TextDocument", "writer_pdf_Export"),
+        ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+        ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+        ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+    ],
+    "html": [
+        ("com.sun.star.text.TextDocument", "HTML (StarWriter)"),
+        ("com.sun.star.sheet.SpreadsheetDocument", "HTML (StarCalc)"),
+        ("com.sun.star.presentation.PresentationDocument", "impress_html_Export"),
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the shared soffice server")
+    parser.add_argument("command", choices=["start", "stop", "status", "watch"])
+    # Server pid for the internal "watch" command, see _watch_server()
+    parser.add_argument("pid", nargs="?", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    match args.command:
+        case "start":
+            if not server_available():
+                print(
+                    "Error: soffice server needs soffice and the UNO Python bindings "
+                    "(python3-uno)",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            with _queue_lock():
+                _connect()
+                _mark_used()
+            print(f"soffice server running on pipe {PIPE_NAME}")
+        case "stop":
+            if stop_server():
+                print("soffice server stopped")
+            else:
+                print("soffice server is not running")
+        case "status":
+            if server_available() and _is_running():
+                print(f"soffice server running on pipe {PIPE_NAME}")
+            else:
+                print("soffice server is not running")
+        case "watch":
+            _watch_server(args.pid)
+
+
+def server_available():
+    """Check whether conversions can go through the shared server."""
+    return SERVER_ENABLED and uno is not None and shutil.which("soffice") is not None
+
+
+def convert_document(input_path, output_dir, convert_to, timeout=None):
+    """Convert a document like `soffice --headless --convert-to`.
+
+    Args:
+        input_path: Document to convert
+        output_dir: Directory for the converted file
+        convert_to: Target in --convert-to syntax: "ext[:filter[:options]]"
+        timeout: Seconds to wait for the conversion (default: no limit)
+
+    Returns:
+        Path: The converted file, output_dir / "<input stem>.<ext>"
+
+    Raises:
+        RuntimeError: If the conversion produced no output file
+        FileNotFoundError: If soffice is not installed
+        subprocess.TimeoutExpired: If the conversion took longer than timeout
+    """
+    input_path = Path(input_path).resolve()
+    output_dir = Path(output_dir).resolve()
+    extension, _, filter_spec = convert_to.partition(":")
+    filter_name, _, filter_options = filter_spec.partition(":")
+    output_path = output_dir / f"{input_path.stem}.{extension}"
+
+    if server_available():
+        try:
+            _run_on_server(
+                _export, timeout, input_path, output_path, extension, filter_name, filter_options
+            )
+            return output_path
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception as e:
+            print(f"Warning: soffice server failed ({e}), running soffice once", file=sys.stderr)
+
+    result = subprocess.run(
+        [
+            "soffice",
+            "--headless",
+            "--convert-to",
+            convert_to,
+            "--outdir",
+            str(output_dir),
+            str(input_path),
+        ],
+        capture_output=True,
+        timeout=timeout,
+        text=True,
+    )
+    if result.returncode != 0 or not output_path.exists():
+        raise RuntimeError(result.stderr.strip() or f"Conversion of {input_path.name} failed")
+    return output_path
+
+
+def recalculate_document(path, timeout=None):
+    """Recalculate all formulas of a spreadsheet and save it in place.
+
+    Args:
+        path: Spreadsheet to recalculate
+        timeout: Seconds to wait for the recalculation (default: no limit)
+
+    Returns:
+        bool: True if the server recalculated the file, False if the server is
+            not available and the caller should fall back to a one-shot soffice
+
+    Raises:
+        subprocess.TimeoutExpired: If the recalculation took longer than timeout
+    """
+    if not server_available():
+        return False
+    try:
+        _run_on_server(_recalculate, timeout, Path(path).resolve())
+        return True
+    except subprocess.TimeoutExpired:
+        raise
+    except Exception as e:
+        print(f"Warning: soffice server failed ({e}), running soffice once", file=sys.stderr)
+        return False
+
+
+def stop_server():
+    """Stop the shared server. Returns True if a server was running."""
+    stopped = False
+    if uno is not None:
+        try:
+            _resolve_desktop().terminate()
+            stopped = True
+        except NoConnectException:
+            pass
+        except Exception:
+            # The bridge is disposed while soffice shuts down
+            stopped = True
+
+    return _kill_server(signal.SIGTERM) or stopped
+
+
+def _kill_server(sig):
+    """Send sig to the server's process group and forget its pid.
+
+    The group also holds soffice.bin, which the soffice launcher starts.
+    Returns True if the signal was delivered.
+    """
+    pid_file = STATE_DIR / "server.pid"
+    try:
+        os.killpg(int(pid_file.read_text()), sig)
+        killed = True
+    except (OSError, ValueError):
+        killed = False
+    pid_file.unlink(missing_ok=True)
+    return killed
+
+
+def _run_on_server(operation, timeout, *args):
+    """Run operation(desktop, *args) on the server, one request at a time.
+
+    A request that exceeds timeout leaves soffice busy, so the server is
+    killed (a UNO call could block on it as well) and the next request
+    starts a fresh one.
+    """
+    with _queue_lock():
+        desktop = _connect()
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = operation(desktop, *args)
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        worker.join(timeout)
+        _mark_used()
+        if worker.is_alive():
+            _kill_server(signal.SIGKILL)
+            raise subprocess.TimeoutExpired("soffice server", timeout)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+
+@contextlib.contextmanager
+def _queue_lock():
+    """Hold the lock that serializes requests to the server across processes."""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(STATE_DIR / "queue.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _connect():
+    """Return the server's Desktop, starting the server if it is not running."""
+    try:
+        return _resolve_desktop()
+    except NoConnectException:
+        pass
+
+    process = _start_server()
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while True:
+        try:
+            return _resolve_desktop()
+        except NoConnectException:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("soffice server did not start")
+            time.sleep(0.25)
+
+
+def _mark_used():
+    """Record that the server just handled a request, see _watch_server()."""
+    (STATE_DIR / "last_used").touch()
+
+
+def _watch_server(pid):
+    """Stop the server with the given pid once it has been idle for IDLE_TIMEOUT.
+
+    Runs as a detached process next to each server. Exits early when the server
+    is stopped or replaced, which is noticed through the pid file.
+    """
+    pid_file = STATE_DIR / "server.pid"
+    last_used = STATE_DIR / "last_used"
+    while True:
+        time.sleep(max(1, min(IDLE_TIMEOUT, 30)))
+        try:
+            if int(pid_file.read_text()) != pid:
+                return
+            idle = time.time() - last_used.stat().st_mtime
+        except (OSError, ValueError):
+            return
+        if idle < IDLE_TIMEOUT:
+            continue
+        # Wait for requests in progress, then check again before stopping
+        with _queue_lock():
+            try:
+                if int(pid_file.read_text()) != pid:
+                    return
+                if time.time() - last_used.stat().st_mtime < IDLE_TIMEOUT:
+                    continue
+            except (OSError, ValueError):
+                return
+            _kill_server(signal.SIGTERM)
+            return
+
+
+def _is_running():
+    """Check whether a server accepts connections."""
+    try:
+        _resolve_desktop()
+        return True
+    except NoConnectException:
+        return False
+
+
+def _start_server():
+    """Launch a detached headless soffice that listens on the UNO pipe.
+
+    A detached watcher process (see _watch_server) stops it once idle.
+    """
+    profile = STATE_DIR / "profile"
+    process = subprocess.Popen(
+        [
+            "soffice",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={profile.as_uri()}",
+            f"--accept=pipe,name={PIPE_NAME};urp;StarOffice.ComponentContext",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    (STATE_DIR / "server.pid").write_text(str(process.pid))
+    _mark_used()
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "watch", str(process.pid)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return process
+
+
+def _resolve_desktop():
+    """Connect to the server and return its Desktop.
+
+    Raises:
+        NoConnectException: If no server is listening
+    """
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    context = resolver.resolve(f"uno:pipe,name={PIPE_NAME};urp;StarOffice.ComponentContext")
+    return context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+
+def _properties(**values):
+    """Build a tuple of PropertyValues for UNO calls."""
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+def _load(desktop, path):
+    """Open a document hidden on the server."""
+    document = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(str(path)), "_blank", 0, _properties(Hidden=True)
+    )
+    if document is None:
+        raise RuntimeError(f"soffice could not open {path.name}")
+    return document
+
+
+def _export(desktop, input_path, output_path, extension, filter_name, filter_options):
+    """Store a converted copy of input_path at output_path."""
+    document = _load(desktop, input_path)
+    try:
+        if not filter_name:
+            filter_name = next(
+                (
+                    name
+                    for service, name in EXPORT_FILTERS.get(extension, [])
+                    if document.supportsService(service)
+                ),
+                None,
+            )
+            if filter_name is None:
+                raise RuntimeError(f"No export filter known for .{extension}")
+
+        properties = {"FilterName": filter_name, "Overwrite": True}
+        if filter_options:
+            properties["FilterOptions"] = filter_options
+        document.storeToURL(
+            uno.systemPathToFileUrl(str(output_path)), _properties(**properties)
+        )
+    finally:
+        document.close(True)
+
+
+def _recalculate(desktop, path):
+    """Recalculate all formulas of a spreadsheet and store it in its own format."""
+    document = _load(desktop, path)
+    try:
+        document.calculateAll()
+        document.store()
+    finally:
+        document.close(True)
+
+
+if __name__ == "__main__":
+    main()